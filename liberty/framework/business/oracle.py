@@ -51,6 +51,20 @@ class OracleQuery:
     """
     return sql_query
 
+  @staticmethod
+  def get_column_types():
+    sql_query = """
+        SELECT
+          COLUMN_NAME,
+          MIN(DATA_TYPE) AS DATA_TYPE
+        FROM
+          USER_TAB_COLUMNS
+        WHERE
+          COLUMN_NAME IN :column_names
+        GROUP BY
+          COLUMN_NAME
+    """
+    return sql_query
 
       
   @staticmethod
@@ -68,6 +68,21 @@ class PostgresQuery:
     """
     return sql_query
 
+  @staticmethod
+  def get_column_types():
+    sql_query = """
+      SELECT DISTINCT ON (UPPER(column_name))
+        UPPER(column_name) AS column_name,
+        data_type
+      FROM
+        information_schema.columns
+      WHERE 
+        UPPER(column_name) IN :column_names
+      ORDER BY
+        UPPER(column_name)
+    """
+    return sql_query
+
   @staticmethod
   def get_primary_key(table_id):
     sql_query = f"""
@@ -1,5 +1,4 @@
 from fastapi import HTTPException, Request
-from liberty.framework.utils.encrypt import Encryption
 from liberty.framework.utils.jwt import JWT
 from liberty.framework.services.api_services import API
 from liberty.framework.services.rest_services import Rest
@@ -31,6 +30,9 @@ class ApiController:
     async def delete(self, req: Request):
         return await self.api.post(req)
 
+    async def batch(self, req: Request):
+        return await self.api.batch(req)
+
     async def open(self, req: Request):
         return await self.api.open(req)
     
@@ -40,12 +42,17 @@ class ApiController:
     async def close(self, req: Request):
         return await self.api.close(req)
 
+    def ready(self, req: Request):
+        return self.api.ready(req)
+
+    def clear_cache(self, req: Request):
+        return self.api.clear_cache(req)
+
     async def encrypt(self, req: Request):
         try:
             data = await req.json()
             plain_text = data.get("plain_text")
-            encryption = Encryption(self.jwt)
-            encrypted_text = encryption.encrypt_text(plain_text)
+            encrypted_text = self.api.encryption.encrypt_text(plain_text)
             return {"encrypted": encrypted_text}
         except Exception as err:
             raise HTTPException(status_code=500, detail=str(err))
@@ -65,6 +72,9 @@ class ApiController:
     async def push_log(self, req: Request):
         return await self.rest.push_log(req)    
 
+    async def push_logs(self, req: Request):
+        return await self.rest.push_logs(req)
+
     async def get_log(self, req: Request):
         return await self.rest.get_log(req) 
     
@@ -0,0 +1,161 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from liberty.framework.database.base_dao import BaseDAO
+from liberty.framework.services.db_pool import PoolInterface
+
+# Queued audit: framework pool, pool alias, table, user and record
+AuditEntry = Tuple[str, str, str, str, Optional[Dict[str, Any]]]
+
+
+class AuditWriter:
+    """
+    Background writer of the audit records, enabled with audit_async = true in db.properties.
+
+    Audits are queued by the requests and written by a task running until `stop`: a batch is
+    written when `batch_size` audits are queued or every `flush_interval` seconds, with one
+    INSERT ... SELECT per pool, table and user. When the writer is not running or the queue is
+    full, the audit is written directly.
+
+    Audits are queued with the alias of their pool, resolved when the batch is written: a pool
+    closed by the pool manager in the meantime is opened again with `open_pool`. The audits of
+    a failed write are retried with the next batch, up to `queue_size` audits.
+
+    The audited rows are read when the batch is written, not when the audit is queued.
+    """
+
+    def __init__(self, db_pools: PoolInterface, open_pool: Callable[[str, str], Awaitable[None]],
+                 batch_size: int = 100, flush_interval: float = 1.0, queue_size: int = 10000):
+        self.db_pools = db_pools
+        self.open_pool = open_pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        # Audits of the failed writes, retried with the next batch
+        self.failed: List[AuditEntry] = []
+
+    def configure(self, batch_size: int = None, flush_interval: float = None, queue_size: int = None):
+        """
+        Change the settings of the writer, before it is started.
+        """
+        if batch_size:
+            self.batch_size = batch_size
+        if flush_interval:
+            self.flush_interval = flush_interval
+        if queue_size:
+            self.queue_size = queue_size
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self):
+        if not self.running:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Stop the writer once the queued audits have been written.
+        """
+        if not self.running:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    async def get_dao(self, framework_pool: str, pool: str) -> BaseDAO:
+        """
+        Get the DAO of a pool, opened again if it has been closed since the audit was queued.
+        """
+        if not self.db_pools.is_pool_open(pool):
+            await self.open_pool(framework_pool, pool)
+        return self.db_pools.get_pool(pool).db_dao
+
+    async def audit(self, framework_pool: str, pool: str, table_id: str, user_id: str, context: dict):
+        """
+        Queue the audit of a record, see `BaseDAO.audit`.
+
+        Args:
+            framework_pool (str): The pool of the framework, used to open the audited pool.
+            pool (str): The alias of the audited pool.
+        """
+        if self.running:
+            try:
+                self.queue.put_nowait((framework_pool, pool, table_id, user_id, context.get("body")))
+                return
+            except asyncio.QueueFull:
+                logger.warning("Audit queue is full, writing the audit directly")
+        dao = await self.get_dao(framework_pool, pool)
+        await dao.audit(table_id, user_id, context)
+
+    async def write(self, batch: List[AuditEntry]) -> List[AuditEntry]:
+        """
+        Write a batch of audits.
+
+        Returns:
+            List: The audits that could not be written.
+        """
+        # Audits by pool, table and user. Audits without a record audit the whole table, once
+        groups: Dict[Tuple[str, str, str, str, bool], List[AuditEntry]] = {}
+        for entry in batch:
+            framework_pool, pool, table_id, user_id, body = entry
+            groups.setdefault((framework_pool, pool, table_id.upper(), user_id, not body), []).append(entry)
+
+        failed = []
+        for (framework_pool, pool, table_id, user_id, _), entries in groups.items():
+            records = [body for *_, body in entries if body]
+            try:
+                # The pool is not closed by the manager while the audits are written
+                with self.db_pools.lease():
+                    dao = await self.get_dao(framework_pool, pool)
+                    await dao.audit_many(table_id, user_id, records)
+            except Exception as e:
+                logger.error(f"Failed to write {len(entries)} audits of {table_id} on {pool}, retrying: {str(e)}")
+                failed.extend(entries)
+        return failed
+
+    def keep_failed(self, failed: List[AuditEntry]):
+        """Keep the failed audits for the next batch, dropping the oldest ones beyond queue_size."""
+        dropped = len(failed) - self.queue_size
+        if dropped > 0:
+            for framework_pool, pool, table_id, user_id, body in failed[:dropped]:
+                logger.error(f"Audit dropped, table {table_id} on {pool}, user {user_id}, record {body}")
+            failed = failed[dropped:]
+        self.failed = failed
+
+    async def run(self):
+        stopping = False
+        while not stopping:
+            # Audits of the previous failed write are retried once the flush interval has elapsed
+            batch, self.failed = self.failed, []
+            retried = len(batch)
+            if not batch:
+                entry = await self.queue.get()
+                if entry is None:
+                    break
+                batch.append(entry)
+
+            # Collect the batch until it is full or the flush interval has elapsed
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) - retried < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    entry = self.queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self.queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self.keep_failed(await self.write(batch))
+
+        for framework_pool, pool, table_id, user_id, body in self.failed:
+            logger.error(f"Audit not written, table {table_id} on {pool}, user {user_id}, record {body}")
+        self.failed = []
@@ -1,21 +1,46 @@
 import logging
 logger = logging.getLogger(__name__)
 
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Union
-from sqlalchemy import text
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from sqlalchemy import TextClause, bindparam, text
+from sqlalchemy.types import NullType
 import re
 from abc import abstractmethod
 import json
 from liberty.framework.business.postgres import PostgresQuery
+from liberty.framework.database.keyset import decode_cursor, encode_cursor, parse_order_by, seek_predicate
+from liberty.framework.database.template import SQLText, StatementTemplate
+from liberty.framework.utils.cache import TTLCache
+
+# Resolved LY_QRY_FMW / LY_QRY_SQL definitions, shared by all pools
+# Key: (source, query_id, crud, db_type, pool)
+query_cache = TTLCache(ttl=300, max_size=2048)
+
+# Statements writing to these tables invalidate the query definitions cache
+QUERY_DEFINITION_TABLES = re.compile(r"\b(LY_QRY_FMW|LY_QRY_SQL|LY_DB_SCHEMA)\b", re.IGNORECASE)
+
+# Statements writing exactly one row per record of a VALUES list
+SINGLE_ROW_INSERT = re.compile(r"^\s*INSERT\b(?!.*\bON\s+(CONFLICT|DUPLICATE)\b)", re.IGNORECASE | re.DOTALL)
 
 class BaseDAO:
     def __init__(self, config: dict):
         self.config = config
         self.engine = None
         self.async_session = None
+        # Column data types used to build filters, loaded lazily from the catalog
+        self.column_types = TTLCache(ttl=config.get("column_cache_ttl", 3600), max_size=config.get("column_cache_size", 10000))
+        # Queries wrapped for filtering and parsed into templates, by SQL text
+        self.statement_templates = TTLCache(max_size=config.get("statement_cache_size", 512))
+        # Statements executed on the pool, sized as the prepared statement cache of the driver
+        self.statements = TTLCache(max_size=config.get("statement_cache_size", 512))
+        # Audited tables whose audit table exists, and the template of their primary key predicate
+        self.audit_tables = TTLCache(max_size=1024)
+        # The driver reports the rows written by executemany, see is_bulk_write
+        self.executemany_rowcount = True
 
     
     @abstractmethod
@@ -35,6 +60,27 @@ class BaseDAO:
             self.engine, class_=AsyncSession, expire_on_commit=False
         )
 
+    async def warmup(self):
+        """
+        Open the minimum connections of the pool (poolMin) so that the first requests
+        do not wait for them. Disabled with pool_warmup = false.
+        """
+        count = min(int(self.config.get("poolMin") or 0), self.engine.pool.size())
+        if not self.config.get("pool_warmup", True) or count <= 1:
+            return
+
+        async def connect():
+            return await self.engine.connect()
+
+        # Check out the connections concurrently, idle ones are reused and the others opened,
+        # then return them to the pool
+        connections = await asyncio.gather(*(connect() for _ in range(count)), return_exceptions=True)
+        for connection in connections:
+            if isinstance(connection, Exception):
+                logger.warning(f"Pool {self.config.get('pool_alias')}: connection warmup failed: {str(connection)}")
+            else:
+                await connection.close()
+
     def get_session(self) -> AsyncSession:
         """
         Get an AsyncSession instance.
@@ -54,6 +100,80 @@ class BaseDAO:
         """
         pass    
 
+    async def load_column_types(self, column_names: List[str]) -> Dict[str, str]:
+        """
+        Return the data type of each column found in the catalog. Must be implemented by subclasses.
+        """
+        pass
+
+    async def get_column_types(self, column_names: List[str]) -> Dict[str, str]:
+        """
+        Return the data type of each column, using the column type cache of the pool.
+        Columns missing from the cache are loaded from the catalog with a single query.
+
+        Args:
+            column_names (List[str]): The column names used in the filters.
+
+        Returns:
+            Dict[str, str]: The data type of each column, empty if the column is not found in the catalog.
+        """
+        column_types = {}
+        missing = []
+        for name in column_names:
+            column_type = self.column_types.get(name.upper())
+            if column_type is None:
+                missing.append(name.upper())
+            else:
+                column_types[name] = column_type
+
+        if missing:
+            loaded = await self.load_column_types(missing)
+            for name in column_names:
+                if name.upper() in missing:
+                    # Cache unknown columns as well, to avoid looking them up on every request
+                    column_type = loaded.get(name.upper(), "")
+                    self.column_types.set(name.upper(), column_type)
+                    column_types[name] = column_type
+
+        return column_types
+
+    def invalidate_audit_metadata(self, table_id: Optional[str] = None) -> int:
+        """
+        Remove the audit metadata of a table (default: all tables), checked again on the next audit.
+        """
+        if table_id is None:
+            return self.audit_tables.clear()
+        return 0 if self.audit_tables.pop(table_id.upper()) is None else 1
+
+    async def get_audit_metadata(self, table_id: str) -> Dict[str, Any]:
+        """
+        Get the audit metadata of a table, creating its audit table if it does not exist.
+        Cached per pool: after the first audit of a table, an audit is a single INSERT statement.
+
+        Returns:
+            dict: The template of the primary key predicate (`primary_key`), None if the table has no primary key.
+        """
+        metadata = self.audit_tables.get(table_id.upper())
+        if metadata is not None:
+            return metadata
+
+        check_audit = await self.check_audit_table(table_id)
+        if (check_audit[0][0] == 0):
+            await self.create_audit_table(table_id)
+
+        # Get primary key to construct WHERE clause
+        result_pk = await self.get_primary_key(table_id)
+        primary_key = result_pk[0][0] if result_pk and result_pk[0][0] else None
+        metadata = {"primary_key": StatementTemplate(primary_key) if primary_key else None}
+        self.audit_tables.set(table_id.upper(), metadata)
+        return metadata
+
+    def invalidate_column_types(self) -> int:
+        """
+        Remove all cached column types of the pool, they are reloaded on the next filter.
+        """
+        return self.column_types.clear()
+
     def replace_schema_placeholders(self, query: str, schemas: List[Dict[str, str]]) -> str:
         """
         Replace placeholders (e.g., #SCHEMA.PLACEHOLDER#) in the query with actual values.
@@ -73,18 +193,66 @@ class BaseDAO:
             query = regex.sub(value, query)
         return query
 
-    async def construct_query_where(self, query: str, where: List[Dict[str, str]]) -> str:
+    async def construct_query_where(self, query: str, where: List[Dict[str, str]], bind_params: Optional[Dict[str, Any]] = None) -> str:
         """
         Construct where clause with column type. Must be implemented by subclasses.
+        Values are added to `bind_params` instead of the query when it is provided.
         """
         pass          
      
-    def construct_offset(self, query, context: Dict[str, str]):
+    def construct_offset(self, query, context: Dict[str, str], bind_params: Optional[Dict[str, Any]] = None):
         """
         Construct offset and limit for the query. Must be implemented by subclasses.
+        Values are added to `bind_params` instead of the query when it is provided.
         """
         pass
+
+    def filter_value(self, value: Any, bind_params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the SQL expression of a filter value: a literal, or a bind parameter if `bind_params` is provided.
+        """
+        if bind_params is not None:
+            name = f"filter_{len(bind_params)}"
+            bind_params[name] = value
+            return f":{name}"
+        if isinstance(value, str):
+            return f"'{value}'"
+        return str(value)
     
+    def keyset_value(self, value: Any, bind_params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the SQL expression of a keyset cursor value: a typed literal, or a bind parameter if `bind_params` is provided.
+        """
+        if bind_params is not None:
+            return self.filter_value(value, bind_params)
+        if isinstance(value, datetime):
+            return f"TIMESTAMP '{value.isoformat(sep=' ')}'"
+        if isinstance(value, date):
+            return f"DATE '{value.isoformat()}'"
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return str(value)
+
+    def get_keyset(self, target_query, context) -> Optional[Dict[str, Any]]:
+        """
+        Get the keyset pagination of a query from the context: the columns of its order by clause,
+        and the values and row counts decoded from the cursor of the previous page.
+
+        Returns:
+            dict: The keyset (columns, values, count), or None for offset pagination. Queries without
+            an order by clause, or ordered by expressions, use offset pagination.
+        """
+        if context.get("pagination") != "keyset":
+            return None
+        columns = parse_order_by(target_query[0][1])
+        if columns is None:
+            return None
+        if context.get("cursor"):
+            values, count = decode_cursor(context["cursor"], columns)
+        else:
+            values, count = None, 0
+        return {"columns": columns, "values": values, "count": count}
+
     async def check_audit_table(self, table_id: str) -> str:
         """
         Check if audit table exists. Must be implemented by subclasses.
@@ -112,6 +280,22 @@ class BaseDAO:
         """
         pass
 
+    @staticmethod
+    def invalidate_query_cache(query_id: Optional[int] = None, pool: Optional[str] = None) -> int:
+        """
+        Remove resolved query definitions from the cache.
+
+        Args:
+            query_id (int): Only remove definitions of this query ID (default: all).
+            pool (str): Only remove definitions resolved for this pool alias (default: all).
+
+        Returns:
+            int: The number of entries removed.
+        """
+        return query_cache.invalidate(
+            lambda key: (query_id is None or key[1] == query_id) and (pool is None or key[4] == pool)
+        )
+
     def get_pool_info(self):
         return {
             "alias": self.config["pool_alias"],                # Alias of the pool
@@ -119,7 +303,10 @@ class BaseDAO:
             "active": self.engine.pool.checkedout(),            # Total connections in the pool
             "idle": self.engine.pool.checkedin(),              # Idle connections
             "waiting": self.engine.pool.overflow(),            # Number of waiting connections
-            "max": self.engine.pool.size()   # Max allowed connections
+            "max": self.engine.pool.size(),   # Max allowed connections
+            # Executed statements already seen (hits) or new (misses), counted with bind_variables only:
+            # the driver caches statements by text, rendered values make each text unique
+            "statements": self.statements.stats() if self.config.get("bind_variables") else None,
         }     
 
     async def close_pool(self):
@@ -133,55 +320,82 @@ class BaseDAO:
             self.async_session = None  # Reset the sessionmaker to None
                    
     def replace_variables_placeholders(self, query: str, variables: Dict[str, Union[str, int, float, None]]) -> str:
-        for name, value in variables.items():
-            if name != "\r" : 
-                if isinstance(value, (int, float)) or value is not None:
-                    # Handle dollar signs and escape single quotes in strings
-                    if isinstance(value, str):
-                        value = value.replace("$$", "$$$$")
-                        value = value.replace("'", "''")
-
-                    # Replace #:VARIABLE# with VALUE
-                    regex_string = re.compile(rf"#\:{name}#", re.IGNORECASE)
-                    query = regex_string.sub(str(value), query)
-
-                    # Replace :VARIABLE with 'VALUE' or VALUE (based on type)
-                    if isinstance(value, str):
-                        value = f"'{value}'"
-                    regex_string = re.compile(rf"\:{name}\b", re.IGNORECASE)
-                    query = regex_string.sub(str(value), query)
+        return StatementTemplate(query).render(variables)
 
-        return query
+    def get_statement_template(self, target_query, columns: Optional[bool] = None) -> StatementTemplate:
+        """
+        Get the compiled template of a query (cached per pool).
 
+        Args:
+            target_query: The query definition (SQL query, order by clause, pool).
+            columns (bool): Wrap the query for filtering, to return the columns only if True.
+                If None, the query is used as-is (POST, PUT, DELETE).
 
+        Returns:
+            StatementTemplate: The template of the query.
+        """
+        cache_key = (target_query[0][0], target_query[0][1], columns)
+        template = self.statement_templates.get(cache_key)
+        if template is None:
+            if columns is None:
+                template = StatementTemplate(target_query[0][0])
+            else:
+                # Add SELECT AND WHERE around the query for filtering 
+                template = StatementTemplate(self.construct_query(target_query, columns))
+            self.statement_templates.set(cache_key, template)
+        return template
+
+    def track_statement(self, statement: str):
+        """
+        Count executions of statements already executed on this pool (likely prepared by the driver).
+        Statements are counted only when bind_variables is enabled.
+        """
+        if not self.config.get("bind_variables"):
+            return
+        if self.statements.get(statement) is None:
+            self.statements.set(statement, True)
 
-    async def build_query (self, target_query, context, columns: bool):
+    async def build_query (self, target_query, context, columns: bool, keyset: Optional[Dict[str, Any]] = None):
             try:
                 # Query[0][0] : SQL Query 
                 # Query[0][1] : Order by clause 
                 # Query[0][2] : Pool in case of overriding inside the definition of the query 
-                # Add SELECT AND WHERE around the query for filtering 
-                query = self.construct_query(target_query, columns)
+                template = self.get_statement_template(target_query, columns)
+
+                # Values are rendered inside the statement, or bound if enabled for the pool
+                bind_params = {} if self.config.get("bind_variables") else None
+
+                # Variables from the context take precedence over the request parameters
+                variables = {}
+                if "params" in context:
+                    variables.update(json.loads(context["params"]))
+                if "where" in context:
+                    variables.update(context["where"])
+                query = template.render(variables, bind_params)
 
                 if "q" in context:
                     # Create the where clause of the query with the context 
                     q = json.loads(context["q"])
-                    query = await self.construct_query_where(query, q)
+                    query = await self.construct_query_where(query, q, bind_params)
 
-                if "where" in context:
-                    query = self.replace_variables_placeholders(query, context["where"])
-
-                if "params" in context:
-                    params = json.loads(context["params"])
-                    query = self.replace_variables_placeholders(query, params)
+                # Keyset pagination: rows after the last row of the previous page
+                if keyset and keyset["values"] is not None:
+                    query += "\nAND " + seek_predicate(
+                        keyset["columns"], keyset["values"], lambda value: self.keyset_value(value, bind_params)
+                    )
 
                 # Add ORDER BY Clause 
                 if target_query[0][1] is not None:
                     query += '\nORDER BY ' + target_query[0][1]
 
                 # Offset
-                query = self.construct_offset(query, context)
+                # Keyset pagination fetches one more row, to find if it is tied with the last row of the page
+                if keyset:
+                    context = {**context, "row_offset": 0, "row_limit": int(context["row_limit"]) + 1}
+                query = self.construct_offset(query, context, bind_params)
                 # Return the query 
+                if bind_params:
+                    return text(query).bindparams(**bind_params)
                 return text(query)
             
             except Exception as err:
@@ -203,6 +417,11 @@ class BaseDAO:
             list: The result rows from the executed query.
         """
         try:
+            cache_key = ("framework", int(request.get('QUERY')), request.get('CRUD'), db_type, self.config["pool_alias"])
+            rows = query_cache.get(cache_key)
+            if rows is not None:
+                return rows
+
             query = text(PostgresQuery.get_framework_query())
 
             # Open a session
@@ -210,6 +429,8 @@ class BaseDAO:
                 result = await session.execute(query,
                     {"query_id": int(request.get('QUERY')), "crud": request.get('CRUD'), "db_type": db_type})
             rows = result.fetchall()    
+            if rows:
+                query_cache.set(cache_key, rows)
             return rows
         
         except Exception as e:
@@ -231,6 +452,11 @@ class BaseDAO:
             list: Rows of the query result.
         """
         try:
+            cache_key = ("query", int(request.get('QUERY')), request.get('CRUD'), db_type, self.config["pool_alias"])
+            cached_rows = query_cache.get(cache_key)
+            if cached_rows is not None:
+                return cached_rows
+
             query = text(PostgresQuery.get_sql_query())
 
             # Open a session
@@ -264,6 +490,7 @@ class BaseDAO:
                     row_list[0] = updated_query  # Update the first column
                 updated_rows.append(tuple(row_list))  # Convert back to a tuple and append
 
+            query_cache.set(cache_key, updated_rows)
             return updated_rows
 
         except Exception as err:
@@ -273,46 +500,69 @@ class BaseDAO:
             raise RuntimeError(f"Query execution failed: {str(err)}")
 
 
-    async def get(self, query: str, context) -> List[Dict[str, Any]]:
+    async def get(self, query: str, context, columnar: bool = False) -> List[Dict[str, Any]]:
         """
         Executes a query and returns the result along with metadata.
 
         Args:
             query (str): The SQL query to execute.
+            columnar (bool): Return each row as a list of values, in the order of `columns`,
+                instead of a dictionary.
         Returns:
             Dict[str, Any]: A dictionary containing rows, column metadata, and row count.
         """
         try:
             # Use SQLAlchemy's `text` to prepare the query
-            statement = await self.build_query(query, context, False)
+            keyset = self.get_keyset(query, context)
+            row_limit = int(context["row_limit"])
 
             # Open a session
             async with self.get_session() as session:
-                result = await session.execute(statement)
-   
-            # Fetch all rows
-            rows = result.fetchall()
+                while True:
+                    statement = await self.build_query(query, {**context, "row_limit": row_limit}, False, keyset)
+                    self.track_statement(statement.text)
+                    statement = await self.convert_statement(session, statement)
+                    result = await session.execute(statement)
+
+                    # Fetch all rows
+                    rows = result.fetchall()
+
+                    # Column names are upper-cased once for all rows
+                    keys = [key.upper() for key in result.keys()]
+
+                    next_row = None
+                    if not keyset:
+                        break
+                    rows, next_row = self.keyset_rows(keyset, keys, rows, row_limit)
+                    if rows or next_row is None:
+                        break
+                    # All the rows read have the same values: the page is read again, extended to the next values
+                    row_limit *= 2
+
             processed_rows = []
 
             if rows:
-                # Convert rows to a list of dictionaries with proper types
-                processed_rows = [
-                    {key.upper(): (value.isoformat() if isinstance(value, (datetime, date)) else value)
-                    for key, value in row._mapping.items()}
-                    for row in rows
-                ]
+                # Convert rows to a list of dictionaries
+                # Dates and decimals are kept as is, they are converted by the JSON serializer
+                if columnar:
+                    processed_rows = [list(row) for row in rows]
+                else:
+                    processed_rows = [dict(zip(keys, row)) for row in rows]
 
                 # Extract metadata from the first row
                 meta_data = [
-                    {"name": key.upper(), "type": type(value).__name__ if value is not None else "UNKNOWN"}
-                    for key, value in rows[0]._mapping.items()
+                    {"name": key, "type": type(value).__name__ if value is not None else "UNKNOWN"}
+                    for key, value in zip(keys, rows[0])
                 ]
             else:
                 # No rows: fallback to column names only
-                meta_data = [{"name": key.upper(), "type": "UNKNOWN"} for key in result.keys()]
+                meta_data = [{"name": key, "type": "UNKNOWN"} for key in keys]
                 
 
-            return {"status": "success", "pool": self.config["pool_alias"], "rows": processed_rows, "rowCount": result.rowcount, "meta_data": meta_data}
+            response = {"status": "success", "pool": self.config["pool_alias"], "rows": processed_rows, "rowCount": len(rows) if keyset else result.rowcount, "meta_data": meta_data, "columns": keys}
+            if keyset:
+                response.update(self.keyset_page(keyset, keys, rows, processed_rows, next_row))
+            return response
 
         except Exception as e:
             logger.exception(f"Error executing query: {e}")
@@ -321,6 +571,280 @@ class BaseDAO:
             raise RuntimeError(f"Query execution failed: {str(e)}")  
 
 
+    def keyset_rows(self, keyset: Dict[str, Any], keys: List[str], rows, row_limit: int) -> Tuple[list, Any]:
+        """
+        Split the rows read for a keyset page (one more than the page) into the rows of the page
+        and the first row of the next page.
+
+        The order by columns may not identify a row uniquely. The seek predicate of the next page
+        could not select the rows left with the same values as the last row of the page: these rows
+        are moved to the next page, which starts after the last row with other values.
+
+        Returns:
+            Tuple[list, Any]: The rows of the page (empty if all the rows read have the same values as
+            the first row of the next page) and the first row of the next page (None if there are no more rows).
+        """
+        if len(rows) <= row_limit:
+            return rows, None
+        names = [name.split(".")[-1].upper() for name, _ in keyset["columns"]]
+        if not all(name in keys for name in names):
+            return rows[:row_limit], rows[row_limit]
+        indexes = [keys.index(name) for name in names]
+        next_values = [rows[row_limit][index] for index in indexes]
+        end = row_limit
+        while end > 0 and [rows[end - 1][index] for index in indexes] == next_values:
+            end -= 1
+        return rows[:end], rows[end]
+
+    def keyset_page(self, keyset: Dict[str, Any], keys: List[str], rows, processed_rows, next_row) -> Dict[str, Any]:
+        """
+        Number the rows of a keyset page after the previous pages, and build the cursor of the next page.
+
+        Returns:
+            dict: `cursor` of the next page (None if there are no more rows) and `offset` (number of
+            rows before the page).
+
+        Raises:
+            ValueError: If rows follow and an order by column is not returned by the query.
+        """
+        count = keyset["count"]
+        if count and "ROW_ID" in keys:
+            index = "ROW_ID" if processed_rows and isinstance(processed_rows[0], dict) else keys.index("ROW_ID")
+            for row in processed_rows:
+                row[index] += count
+
+        cursor = None
+        names = [name.split(".")[-1].upper() for name, _ in keyset["columns"]]
+        if rows and next_row is not None:
+            missing = [name for name in names if name not in keys]
+            if missing:
+                raise ValueError(f"Keyset pagination requires the order by columns in the query: {', '.join(missing)}")
+            indexes = [keys.index(name) for name in names]
+            values = [rows[-1][index] for index in indexes]
+            cursor = encode_cursor(keyset["columns"], values, count + len(rows))
+        return {"cursor": cursor, "offset": count}
+
+    async def stream(self, query: str, context, batch_size: Optional[int] = None, columnar: bool = False) -> AsyncIterator[List[Any]]:
+        """
+        Executes a query and yields the result by batches, using a server-side cursor.
+
+        Args:
+            query (str): The SQL query to execute.
+            batch_size (int): The number of rows fetched per batch (default: stream_batch_size of the pool).
+            columnar (bool): Yield each row as a list of values instead of a dictionary.
+
+        Yields:
+            List[str]: The column names (first item).
+            List[Dict[str, Any]]: The next batch of rows.
+        """
+        batch_size = batch_size or self.config.get("stream_batch_size", 1000)
+        try:
+            statement = await self.build_query(query, context, False)
+            self.track_statement(statement.text)
+
+            async with self.get_session() as session:
+                statement = await self.convert_statement(session, statement)
+                result = await session.stream(statement, execution_options={"yield_per": batch_size})
+                keys = [key.upper() for key in result.keys()]
+                yield keys
+
+                async for partition in result.partitions():
+                    if columnar:
+                        yield [list(row) for row in partition]
+                    else:
+                        yield [dict(zip(keys, row)) for row in partition]
+
+        except Exception as e:
+            logger.exception(f"Error streaming query: {e}")
+            raise RuntimeError(f"Query execution failed: {str(e)}")
+
+    def format_value(self, value: Any, bind: bool = False) -> Any:
+        """
+        Format a value of a POST, PUT or DELETE request.
+
+        Args:
+            value: The value from the body of the request.
+            bind (bool): Return the value to bind instead of a SQL literal. Arrays of records
+                are always rendered as SQL (VALUES list).
+
+        Returns:
+            The value to bind, or the value formatted as SQL.
+        """
+        replace_null = self.config.get("replace_null") == "Y"
+
+        # Helper to escape SQL values
+        def escape_sql_value(val):
+            if val is None:
+                return "NULL" if not replace_null else "' '"
+            if isinstance(val, str):
+                val = val.replace("'", "''")      # escape quotes
+                val = val.replace(":", r"\:")     # escape colon
+                return f"'{val}'"
+            return str(val)
+
+        if isinstance(value, list):
+            # Format the array of records
+            return SQLText(", ".join(
+                f"({', '.join(escape_sql_value(record[k]) for k in record if k != 'ROW_ID')})"
+                for record in value
+            ))
+
+        if bind:
+            if (value is None or value == "") and replace_null:
+                return " "  # Replace empty values with ' ' if enabled
+            return value
+
+        if isinstance(value, (int, float)):
+            return SQLText(value)  # Use the numeric value as-is
+        if value is None:
+            return SQLText("NULL" if not replace_null else "' '")
+        if isinstance(value, str):
+            if value == "" and replace_null:
+                return SQLText("' '")  # Replace empty string with ' ' if enabled
+            value = value.replace("$$", "$$$$")  # Escape dollar signs
+            value = value.replace("'", "''")  # Escape single quotes
+            value = value.replace(":", r"\:")    # Escape colon inside value
+            return SQLText(f"'{value}'")  # Wrap in single quotes
+        return SQLText(value)
+
+    def get_bulk_rows(self, body: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the variable of a POST, PUT or DELETE request holding an array of records sent
+        with executemany (bulk write).
+
+        Returns:
+            str: The name of the variable, or None if the request is not a bulk write: no array or
+            several arrays, an empty array, or records with different columns.
+        """
+        arrays = [name for name, value in body.items() if isinstance(value, list)]
+        if len(arrays) != 1:
+            return None
+        records = body[arrays[0]]
+        if not records or not all(isinstance(record, dict) for record in records):
+            return None
+        columns = list(records[0].keys())
+        if any(list(record.keys()) != columns for record in records):
+            return None
+        return arrays[0]
+
+    def is_bulk_write(self, template: StatementTemplate, sql: str, rows_name: str) -> bool:
+        """
+        Check if an array of records can be sent with executemany: the array must be the VALUES
+        list of the statement and no rows are returned. If the driver does not report the rows
+        written by executemany, only INSERT statements are sent (one row per record, counted).
+        """
+        if "returning" in sql.lower() or not template.follows_values(rows_name):
+            return False
+        return self.executemany_rowcount or bool(SINGLE_ROW_INSERT.match(sql))
+
+    async def convert_bind_params(self, session: AsyncSession, statement: str, params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert the bound values of a statement (one dictionary per execution) to the types expected by the driver.
+        Values are sent as received by default, the database converts them.
+        """
+        return params
+
+    async def convert_statement(self, session: AsyncSession, statement: TextClause) -> TextClause:
+        """
+        Convert the values bound to a query built by `build_query`, see `convert_bind_params`.
+        The parameters are bound without a SQL type, the type of the values is not cast.
+        """
+        if not self.config.get("bind_variables"):
+            return statement
+        params = statement.compile().params
+        if not params:
+            return statement
+        converted = await self.convert_bind_params(session, statement.text, [params])
+        return text(statement.text).bindparams(
+            *(bindparam(name, value, type_=NullType()) for name, value in converted[0].items())
+        )
+
+    async def write_bulk(self, session: AsyncSession, template: StatementTemplate, body: Dict[str, Any], rows_name: str, bind_params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Execute a POST, PUT or DELETE request for an array of records with executemany.
+
+        The array placeholder (e.g. `VALUES :DD_COLUMNS_ARRAY`) is rendered as one row of bind
+        parameters, the records are sent by chunks of `bulk_chunk_size` in the transaction of the session.
+
+        Returns:
+            dict: The number of rows (total and per chunk).
+        """
+        replace_null = self.config.get("replace_null") == "Y"
+        records = body[rows_name]
+        columns = [column for column in records[0] if column != "ROW_ID"]
+
+        # One row of bind parameters in place of the array
+        variables = {
+            name: self.format_value(value, bind_params is not None)
+            for name, value in body.items()
+            if name != "\r" and name != rows_name
+        }
+        variables[rows_name] = SQLText("(" + ", ".join(f":BULK_{i}" for i in range(len(columns))) + ")")
+        statement = template.render(variables, bind_params)
+        self.track_statement(statement)
+
+        params = [
+            {
+                **(bind_params or {}),
+                **{
+                    f"BULK_{i}": (" " if replace_null else None) if record[column] is None else record[column]
+                    for i, column in enumerate(columns)
+                },
+            }
+            for record in records
+        ]
+
+        chunk_size = max(1, int(self.config.get("bulk_chunk_size", 1000)))
+        chunks = []
+        params = await self.convert_bind_params(session, statement, params)
+        for start in range(0, len(params), chunk_size):
+            chunk = params[start:start + chunk_size]
+            result = await session.execute(text(statement), chunk)
+            # Drivers not reporting the rows of executemany (-1) count the records sent, see is_bulk_write
+            chunks.append(result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(chunk))
+
+        return {"count": sum(chunks), "rows": [], "chunks": chunks, "statement": statement}
+
+    async def write(self, session: AsyncSession, query, context) -> Dict[str, Any]:
+        """
+        Execute a POST (INSERT), PUT (UPDATE), or DELETE query in the transaction of a session.
+
+        Args:
+            session (AsyncSession): The session, with a transaction begun by the caller.
+            query (list): The target query details, where query[0][0] contains the SQL string.
+            context (dict): The context containing parameters like `body`.
+
+        Returns:
+            dict: The number of rows, the rows returned and the executed statement.
+        """
+        template = self.get_statement_template(query)
+
+        # Values are rendered inside the statement, or bound if enabled for the pool
+        bind_params = {} if self.config.get("bind_variables") else None
+
+        # Arrays of records inserted as a VALUES list are sent with executemany
+        body = context.get("body", {})
+        rows_name = self.get_bulk_rows(body) if isinstance(body, dict) else None
+        if rows_name and self.is_bulk_write(template, query[0][0], rows_name):
+            return await self.write_bulk(session, template, body, rows_name, bind_params)
+
+        variables = {
+            name: self.format_value(value, bind_params is not None)
+            for name, value in body.items()
+            if name != "\r"
+        }
+        statement = template.render(variables, bind_params)
+        self.track_statement(statement)
+
+        if bind_params:
+            bind_params = (await self.convert_bind_params(session, statement, [bind_params]))[0]
+        result = await session.execute(text(statement), bind_params or {})
+        if "returning" in statement.lower():
+            rows = [dict(row) for row in result.mappings().all()] 
+        else:
+            rows = [] 
+        return {"count": result.rowcount, "rows": rows, "statement": statement}
+
     async def post(self, query: str, context) -> int:
         """
         Execute a query for POST (INSERT), PUT (UPDATE), or DELETE operations.
@@ -333,76 +857,21 @@ class BaseDAO:
             list: Rows of the query result.
         """
         try:
-            # Use SQLAlchemy's `text` to prepare the query
-            statement = query[0][0]
-            where = context.get("body", {})
-            
-            for name, value in where.items():
-                if name != "\r":
-                    # Process value based on its type
-                    if isinstance(value, list):
-                        # Helper to escape SQL values
-                        def escape_sql_value(val):
-                            if val is None:
-                                return "NULL" if self.config.get("replace_null") != "Y" else "' '"
-                            if isinstance(val, str):
-                                val = val.replace("'", "''")      # escape quotes
-                                val = val.replace(":", r"\:")     # escape colon
-                                return f"'{val}'"
-                            return str(val)
-
-                        # Format the array of records
-                        def format_values(data):
-                            return ", ".join(
-                                f"({', '.join(escape_sql_value(record[k]) for k in record if k != 'ROW_ID')})"
-                                for record in data
-                            )
-
-                        value = format_values(value)
-
-                    elif isinstance(value, (int, float)):
-                        pass  # Use the numeric value as-is
-
-                    elif value is None:
-                        value = "NULL" if self.config.get("replace_null") != "Y" else "' '" 
-
-                    elif isinstance(value, str):
-                        if value == "" and self.config.get("replace_null") == "Y":
-                            value = "' '"  # Replace empty string with ' ' if enabled
-                        else:
-                            value = value.replace("$$", "$$$$")  # Escape dollar signs
-                            value = value.replace("'", "''")  # Escape single quotes
-                            value = value.replace(":", r"\:")    # Escape colon inside value
-                            value = f"'{value}'"  # Wrap in single quotes
-
-                    # Replace #:VARIABLE# with VALUE or 'VALUE'
-                    regex_string_hash = re.compile(rf"#\:{name}#", re.IGNORECASE)
-                    statement = regex_string_hash.sub(str(value), statement)
-
-                    # Replace :VARIABLE with VALUE or 'VALUE'
-                    regex_string_colon = re.compile(rf"\:{name}\b", re.IGNORECASE)
-                    statement = regex_string_colon.sub(str(value), statement)
- 
-
-
             # Open a session
             async with self.get_session() as session:
                 try:
                     async with session.begin():  # Start a transaction
-                        result = await session.execute(text(statement))
                         # Commit is implicit in session.begin() if no exception is raised
-                        if "returning" in statement.lower():
-                            rows = [dict(row) for row in result.mappings().all()] 
-                        else:
-                            rows = [] 
-                        return {"count": result.rowcount, "rows": rows}
+                        results = await self.write(session, query, context)
+                    statement = results.pop("statement")
+                    if QUERY_DEFINITION_TABLES.search(statement):
+                        self.invalidate_query_cache()
+                    return results
                 except Exception as e:
                     logger.exception(f"Error executing statement: {e}")
                     import traceback
                     traceback.print_exc()  
                     raise RuntimeError(f"Query execution failed: {str(e)}")  
-   
-            return result.rowcount
 
         except Exception as e:
             logger.exception(f"Error executing query: {e}")
@@ -411,6 +880,35 @@ class BaseDAO:
             raise RuntimeError(f"Query execution failed: {str(e)}")  
 
 
+    async def batch(self, operations: List[Tuple[Any, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Execute several POST, PUT or DELETE queries in order, in one session and one transaction:
+        all the operations are committed, or none if one of them fails.
+
+        Args:
+            operations (list): The queries and their context (`body`).
+
+        Returns:
+            list: The results of the operations (count, rows and chunks of bulk writes).
+        """
+        results = []
+        async with self.get_session() as session:
+            try:
+                async with session.begin():
+                    for index, (query, context) in enumerate(operations):
+                        try:
+                            results.append(await self.write(session, query, context))
+                        except Exception as e:
+                            raise RuntimeError(f"Operation {index + 1} failed: {str(e)}")
+            except Exception as e:
+                logger.exception(f"Error executing batch: {e}")
+                raise RuntimeError(f"Query execution failed: {str(e)}")
+
+        statements = [result.pop("statement") for result in results]
+        if any(QUERY_DEFINITION_TABLES.search(statement) for statement in statements):
+            self.invalidate_query_cache()
+        return results
+
     async def get_metadata(self, query: str, context) -> List[Dict[str, Any]]:
         """
         Executes a query and returns the result metadata (column names and types).
@@ -426,9 +924,6 @@ class BaseDAO:
                 # Prepare and execute the query
 
                 statement = await self.build_query(query, context, True)
-                if "params" in context and context["params"]:
-                    params = json.loads(context["params"])
-                    self.replace_variables_placeholders(query, params)
 
                 result = await session.execute(statement)
 
@@ -454,42 +949,37 @@ class BaseDAO:
         Returns:
             list: Rows of the result from the audit insertion query.
         """
+        body = context.get("body")
+        await self.audit_many(table_id, user_id, [body] if body else [])
 
-        try:
-            check_audit = await self.check_audit_table(table_id)
+    async def audit_many(self, table_id: str, user_id: str, records: List[Dict[str, Any]]):
+        """
+        Audit several records of a table with a single INSERT ... SELECT statement.
 
-            if (check_audit[0][0] == 0):
-                await self.create_audit_table(table_id)
+        Args:
+            table_id (str): The name of the table to audit.
+            user_id (str): The ID of the user performing the audit.
+            records (list): The records to audit, with the values of their primary key.
+                The whole table is audited if the list is empty.
+        """
+
+        try:
+            metadata = await self.get_audit_metadata(table_id)
 
             statement = await self.insert_audit_table(table_id, user_id)
-            if "body" in context and context["body"]:
-                where = context.get("body", {})
-
-                # Get primary key to construct WHERE clause
-                result_pk =  await self.get_primary_key(table_id)
-
-                statement += f" WHERE {result_pk[0][0]}"
-
-                # Replace placeholders in the query with actual values
-                for name, value in where.items():
-                    if name != "\r":
-                        if isinstance(value, str):
-                            if value == "" and self.config.get("replace_null") == "Y":
-                                value = "' '"  # Replace empty string with ' ' if enabled
-                            else:
-                                value = value.replace("$$", "$$$$")  # Escape dollar signs
-                                value = value.replace("'", "''")  # Escape single quotes
-                                value = f"'{value}'"  # Wrap in single quotes
-                        elif value is None:
-                            value = "NULL" if self.config.get("replace_null") != "Y" else "' '" 
-
-                        # Replace #:VARIABLE# with VALUE
-                        regex_string_hash = re.compile(rf"#\:{name}#", re.IGNORECASE)
-                        statement = regex_string_hash.sub(str(value), statement)
-
-                        # Replace :VARIABLE with 'VALUE' or VALUE
-                        regex_string_colon = re.compile(rf"\:{name}\b", re.IGNORECASE)
-                        statement = regex_string_colon.sub(str(value), statement)
+            if records:
+                if metadata["primary_key"] is None:
+                    raise ValueError(f"Table {table_id} has no primary key")
+                # Primary key predicate with the values of each record
+                predicates = []
+                for record in records:
+                    variables = {
+                        name: self.format_value(value)
+                        for name, value in record.items()
+                        if name != "\r"
+                    }
+                    predicates.append(f"({metadata['primary_key'].render(variables)})")
+                statement += f" WHERE {' OR '.join(predicates)}"
 
             async with self.get_session() as session:
                     try:
@@ -505,6 +995,6 @@ class BaseDAO:
             logger.exception(f"Error in audit method: {err}")
             import traceback
             traceback.print_exc()  
-            raise RuntimeError(f"Query execution failed: {str(e)}")      
+            raise RuntimeError(f"Query execution failed: {str(err)}")      
 
 
@@ -0,0 +1,125 @@
+import base64
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Tuple
+
+# One item of an ORDER BY clause: a column, optionally qualified, and its direction
+ORDER_BY_ITEM = re.compile(r"^\s*((?:\w+\.)?\w+)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+
+
+def parse_order_by(order_by: Optional[str]) -> Optional[List[Tuple[str, bool]]]:
+    """
+    Parse an ORDER BY clause into its columns, for keyset pagination.
+
+    Args:
+        order_by (str): The order by clause of the query (e.g. `APPS_ID`, `MENU_ID, MENU_SEQ DESC`).
+
+    Returns:
+        List[Tuple[str, bool]]: The columns and whether they are sorted in descending order,
+        or None if the clause is empty or contains expressions (keyset pagination is not possible).
+    """
+    if not order_by:
+        return None
+    columns = []
+    for item in order_by.split(","):
+        match = ORDER_BY_ITEM.match(item)
+        if not match:
+            return None
+        columns.append((match.group(1), (match.group(2) or "").upper() == "DESC"))
+    return columns
+
+
+def encode_value(value: Any) -> Any:
+    # None, str, int and float are JSON types
+    if isinstance(value, datetime):
+        return {"ts": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "ts" in value:
+            return datetime.fromisoformat(value["ts"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+    elif value is None or isinstance(value, (str, int, float)):
+        return value
+    raise ValueError("Invalid cursor value")
+
+
+def encode_cursor(columns: List[Tuple[str, bool]], values: List[Any], count: int) -> str:
+    """
+    Build the opaque cursor of the next page.
+
+    Args:
+        columns: The columns of the order by clause.
+        values: The values of these columns in the last row of the page.
+        count (int): The number of rows returned before the next page.
+    """
+    cursor = {"k": [name.upper() for name, _ in columns], "v": [encode_value(value) for value in values], "n": count}
+    return base64.urlsafe_b64encode(json.dumps(cursor, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, columns: List[Tuple[str, bool]]) -> Tuple[List[Any], int]:
+    """
+    Decode a cursor returned by `encode_cursor` for the same order by clause.
+
+    Returns:
+        Tuple[List[Any], int]: The values of the last row of the previous page, and the number of rows before the page.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if data["k"] != [name.upper() for name, _ in columns] or len(data["v"]) != len(columns):
+            raise ValueError("cursor does not match the order of the query")
+        count = data["n"]
+        if not isinstance(count, int):
+            raise ValueError("invalid row count")
+        return [decode_value(value) for value in data["v"]], count
+    except Exception as err:
+        raise ValueError(f"Invalid cursor: {str(err)}")
+
+
+def seek_predicate(columns: List[Tuple[str, bool]], values: List[Any], literal: Callable[[Any], str]) -> str:
+    """
+    Build the condition selecting the rows after the given values, in the order of the columns.
+
+    Row value comparisons are not supported by Oracle, the condition is expanded:
+    (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ...
+
+    NULL values are ordered as by default in PostgreSQL and Oracle: after the other values in
+    ascending order (NULLS LAST), before them in descending order (NULLS FIRST).
+
+    Args:
+        columns: The columns of the order by clause.
+        values: The values of these columns in the last row of the previous page.
+        literal: Returns the SQL expression of a value (literal or bind parameter).
+    """
+    expressions = [None if value is None else literal(value) for value in values]
+
+    def equal(i: int) -> str:
+        name = columns[i][0]
+        return f"{name} IS NULL" if expressions[i] is None else f"{name} = {expressions[i]}"
+
+    def after(i: int) -> Optional[str]:
+        name, descending = columns[i]
+        if expressions[i] is None:
+            # Nothing comes after NULL in ascending order, all values in descending order
+            return f"{name} IS NOT NULL" if descending else None
+        if descending:
+            return f"{name} < {expressions[i]}"
+        return f"({name} > {expressions[i]} OR {name} IS NULL)"
+
+    conditions = []
+    for i in range(len(columns)):
+        term = after(i)
+        if term is not None:
+            conditions.append("(" + " AND ".join([equal(j) for j in range(i)] + [term]) + ")")
+    return "(" + " OR ".join(conditions) + ")" if conditions else "(1 = 0)"
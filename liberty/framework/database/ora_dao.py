@@ -1,18 +1,18 @@
 import logging
 logger = logging.getLogger(__name__)
 import re
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from liberty.framework.database.base_dao import BaseDAO
 from liberty.framework.utils.common import PoolConfig
 from liberty.framework.business.oracle import OracleQuery
 from sqlalchemy.orm import sessionmaker
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 class OracleDAO(BaseDAO):
     def __init__(self, debug_mode: bool, config: PoolConfig):
-        self.config=config
+        super().__init__(config)
         self.debug_mode = debug_mode
         # self.create_engine()
         # self.init_session()
@@ -30,14 +30,19 @@ class OracleDAO(BaseDAO):
             database_url,
             echo=False,  # Debug mode, can be set to False in production
             pool_size=self.config["poolMax"],
-            max_overflow=0,
-            pool_recycle=300,  # Optional: Recycle connections after 300 seconds
-            pool_pre_ping=True,  # Optional: Validate connections before use
+            max_overflow=self.config.get("pool_max_overflow", 0),
+            pool_recycle=self.config.get("pool_recycle", 300),  # Recycle connections after 300 seconds
+            pool_pre_ping=self.config.get("pool_pre_ping", True),  # Validate connections before use
+            pool_timeout=self.config.get("pool_timeout", 30),  # Wait for a free connection (seconds)
+            # Statements kept per connection, reused when the same query text is executed
+            connect_args={"stmtcachesize": self.config.get("statement_cache_size", 512)},
         )
         self.async_session = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
         try:
             async with self.async_session() as session:
                 await session.execute(text("SELECT 1 FROM DUAL"))
+
+            await self.warmup()
                 
         except Exception as e:
             raise RuntimeError(f"Error creating pool: {str(e)}")
@@ -59,6 +64,14 @@ class OracleDAO(BaseDAO):
             column_type = result.fetchall()      
 
         return column_type
+
+    async def load_column_types(self, column_names: List[str]) -> Dict[str, str]:
+        async with self.get_session() as session:
+            statement = text(OracleQuery.get_column_types()).bindparams(bindparam("column_names", expanding=True))
+            result = await session.execute(statement, {"column_names": column_names})
+            column_types = {row[0]: row[1] for row in result.fetchall()}
+
+        return column_types
             
     def construct_query(self, target_query, columns: bool):
         query = ""
@@ -74,16 +87,14 @@ class OracleDAO(BaseDAO):
         
         return query        
     
-    async def construct_query_where(self, query: str, where: List[Dict[str, str]]) -> str:
+    async def construct_query_where(self, query: str, where: List[Dict[str, str]], bind_params: Optional[Dict[str, Any]] = None) -> str:
+        # Get the types of all filtered columns at once (cached per pool)
+        column_types = await self.get_column_types(list(where.keys()))
         for name, where_value in where.items():
             # Get type of the column if column name exist inside the database 
             # Used to convert number without quote and DATE or TIMESTAMP 
             # This is needed for filtering 
-            query_column_type = await self.get_column_type(name)
-
-            query_column = ""
-            if query_column_type and len(query_column_type) > 0:
-                query_column = query_column_type[0][0]
+            query_column = column_types.get(name, "")
 
             if query_column == "integer":
                 column_type = "integer"
@@ -99,14 +110,18 @@ class OracleDAO(BaseDAO):
                 if value is None:
                     query += f"\nAND {name} IS NULL"
                 elif "DATE" in query_column or "TIMESTAMP" in query_column:
-                    query += f"\nAND TO_CHAR({name}, 'yyyy-MM-dd'){eq}'{value}'"
+                    query += f"\nAND TO_CHAR({name}, 'yyyy-MM-dd'){eq}{self.filter_value(value, bind_params)}"
                 elif column_type == "number":
-                    query += f"\nAND {name}{eq}{int(value.replace('%', ''))}"
+                    query += f"\nAND {name}{eq}{self.filter_value(int(value.replace('%', '')), bind_params)}"
                 else:
-                    query += f"\nAND {name}{eq}'{value}'"
+                    query += f"\nAND {name}{eq}{self.filter_value(value, bind_params)}"
         return query
     
-    def construct_offset(self, query, context: Dict[str, str]):
+    def construct_offset(self, query, context: Dict[str, str], bind_params: Optional[Dict[str, Any]] = None):
+        if bind_params is not None:
+            bind_params["row_offset"] = int(context["row_offset"])
+            bind_params["row_limit"] = int(context["row_limit"])
+            return query + " offset :row_offset rows fetch next :row_limit rows only"
         query += f" offset {str(context["row_offset"])} rows"
         query += f" fetch next {str(context["row_limit"])}  rows only"
 
@@ -122,6 +137,7 @@ class OracleDAO(BaseDAO):
         return table_exist    
     
     async def create_audit_table(self, table_id: str) -> str:
+        self.invalidate_audit_metadata(table_id)
         # Open a session
         async with self.get_session() as session:
             try:
@@ -1,18 +1,47 @@
 import logging
 logger = logging.getLogger(__name__)
+import json
 import re
-from sqlalchemy import text
+from datetime import datetime, time
+from decimal import Decimal
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import create_async_engine
 from liberty.framework.database.base_dao import BaseDAO
 from liberty.framework.business.postgres import PostgresQuery
-from typing import Dict, List
+from liberty.framework.utils.cache import TTLCache
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+def to_bool(value: Any) -> bool:
+    return value.strip().lower() in ("true", "t", "yes", "y", "1") if isinstance(value, str) else bool(value)
+
+def to_datetime(value: Any) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if isinstance(value, str) else value
+
+# Conversion of the values received as JSON to the types of the parameters expected by asyncpg
+PARAMETER_CONVERTERS = {
+    "int2": int, "int4": int, "int8": int,
+    "float4": float, "float8": float,
+    "numeric": lambda value: Decimal(str(value)),
+    "bool": to_bool,
+    "date": lambda value: to_datetime(value).date() if isinstance(value, str) else value,
+    "time": lambda value: time.fromisoformat(value) if isinstance(value, str) else value,
+    "timestamp": lambda value: to_datetime(value).replace(tzinfo=None) if isinstance(value, str) else value,
+    "timestamptz": to_datetime,
+    "text": str, "varchar": str, "bpchar": str, "name": str,
+    "json": lambda value: value if isinstance(value, str) else json.dumps(value),
+    "jsonb": lambda value: value if isinstance(value, str) else json.dumps(value),
+}
+
 class PostgresDAO(BaseDAO):
     def __init__(self, debug_mode: bool, config: dict):
-        self.config=config
+        super().__init__(config)
         self.debug_mode = debug_mode
+        # Types of the parameters of the statements, by statement text, see convert_bind_params
+        self.parameter_types = TTLCache(max_size=config.get("statement_cache_size", 512))
+        # asyncpg does not report the rows written by executemany
+        self.executemany_rowcount = False
         # self.create_engine()
         # self.init_session()
 
@@ -27,14 +56,19 @@ class PostgresDAO(BaseDAO):
                 database_url,
                 echo=False,  # Debug mode, can be set to False in production
                 pool_size=self.config["poolMax"],  # Max connections in the pool
-                max_overflow=0,  # No additional connections beyond pool_size
-                pool_recycle=30,  # Recycle idle connections (seconds)
-                pool_pre_ping=True,  # Check connection liveness
+                max_overflow=self.config.get("pool_max_overflow", 0),  # Additional connections beyond pool_size
+                pool_recycle=self.config.get("pool_recycle", 1800),  # Replace connections older than this (seconds)
+                pool_pre_ping=self.config.get("pool_pre_ping", True),  # Check connection liveness on checkout
+                pool_timeout=self.config.get("pool_timeout", 30),  # Wait for a free connection (seconds)
+                # Prepared statements kept per connection, reused when the same query text is executed
+                connect_args={"prepared_statement_cache_size": self.config.get("statement_cache_size", 512)},
             )
             self.async_session = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
 
             async with self.async_session() as session:
                 await session.execute(text("SELECT 1"))
+
+            await self.warmup()
                 
         except Exception as e:
             raise RuntimeError(f"Error creating pool: {str(e)}")
@@ -58,6 +92,42 @@ class PostgresDAO(BaseDAO):
 
         return column_type
 
+    async def load_column_types(self, column_names: List[str]) -> Dict[str, str]:
+        async with self.get_session() as session:
+            statement = text(PostgresQuery.get_column_types()).bindparams(bindparam("column_names", expanding=True))
+            result = await session.execute(statement, {"column_names": column_names})
+            column_types = {row[0]: row[1] for row in result.fetchall()}
+
+        return column_types
+
+
+    async def convert_bind_params(self, session: AsyncSession, statement: str, params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        asyncpg does not convert strings to the types of the columns as literals are (JSON has no
+        date type): the types of the parameters are read from the prepared statement, once per
+        statement text, and the values are converted for all the records.
+        """
+        types = self.parameter_types.get(statement)
+        if types is None:
+            compiled = text(statement).compile(dialect=self.engine.dialect)
+            connection = await (await session.connection()).get_raw_connection()
+            prepared = await connection.driver_connection.prepare(compiled.string)
+            types = {
+                name: parameter.name
+                for name, parameter in zip(compiled.positiontup, prepared.get_parameters())
+            }
+            self.parameter_types.set(statement, types)
+        converters = {name: PARAMETER_CONVERTERS.get(type_name) for name, type_name in types.items()}
+        try:
+            return [
+                {
+                    name: value if value is None or converters.get(name) is None else converters[name](value)
+                    for name, value in record.items()
+                }
+                for record in params
+            ]
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise ValueError(f"Invalid value: {str(e)}")
 
     def construct_query(self, target_query, columns: bool):
         query = ""
@@ -73,16 +143,14 @@ class PostgresDAO(BaseDAO):
         return query
 
 
-    async def construct_query_where(self, query: str, where: List[Dict[str, str]]) -> str:
+    async def construct_query_where(self, query: str, where: List[Dict[str, str]], bind_params: Optional[Dict[str, Any]] = None) -> str:
+        # Get the types of all filtered columns at once (cached per pool)
+        column_types = await self.get_column_types(list(where.keys()))
         for name, where_value in where.items():
             # Get type of the column if column name exist inside the database 
             # Used to convert number without quote and DATE or TIMESTAMP 
             # This is needed for filtering 
-            query_column_type = await self.get_column_type(name)
-
-            query_column = ""
-            if query_column_type and len(query_column_type) > 0:
-                query_column = query_column_type[0][0]
+            query_column = column_types.get(name, "")
 
             if query_column == "integer":
                 column_type = "integer"
@@ -98,15 +166,19 @@ class PostgresDAO(BaseDAO):
                 if value is None:
                     query += f"\nAND {name} IS NULL"
                 elif "date" in query_column or "timestamp" in query_column:
-                    query += f"\nAND TO_CHAR({name}, 'yyyy-MM-dd'){eq}'{value}'"
+                    query += f"\nAND TO_CHAR({name}, 'yyyy-MM-dd'){eq}{self.filter_value(value, bind_params)}"
                 elif column_type == "integer":
-                    query += f"\nAND {name}{eq}{int(value.replace('%', ''))}"
+                    query += f"\nAND {name}{eq}{self.filter_value(int(value.replace('%', '')), bind_params)}"
                 else:
-                    query += f"\nAND {name}{eq}'{value}'"
+                    query += f"\nAND {name}{eq}{self.filter_value(value, bind_params)}"
         return query
     
 
-    def construct_offset(self, query, context: Dict[str, str]):
+    def construct_offset(self, query, context: Dict[str, str], bind_params: Optional[Dict[str, Any]] = None):
+        if bind_params is not None:
+            bind_params["row_offset"] = int(context["row_offset"])
+            bind_params["row_limit"] = int(context["row_limit"])
+            return query + " offset :row_offset limit :row_limit"
         query += f" offset {str(context["row_offset"])}"
         query += f" limit {str(context["row_limit"])}"
         return query    
@@ -121,6 +193,7 @@ class PostgresDAO(BaseDAO):
         return table_exist        
     
     async def create_audit_table(self, table_id: str) -> str:
+        self.invalidate_audit_metadata(table_id)
         # Open a session
         async with self.get_session() as session:
             try:
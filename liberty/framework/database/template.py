@@ -0,0 +1,105 @@
+import re
+from typing import Any, Dict, Optional, Union
+
+# #:VARIABLE# (raw value) or :VARIABLE (literal or bind parameter)
+# Casts (::TYPE), escaped colons (\:) and colons inside words (HH24:MI) are not placeholders
+PLACEHOLDER = re.compile(r"#:(\w+)#|(?<![:\w\\]):(\w+)")
+
+# Text ending with the VALUES keyword, before the placeholder of an array of records
+VALUES_CLAUSE = re.compile(r"\bVALUES\s*$", re.IGNORECASE)
+
+
+class SQLText(str):
+    """
+    Value already formatted as SQL, rendered as-is for both kinds of placeholders and never bound.
+    """
+
+
+class StatementTemplate:
+    """
+    SQL statement parsed once into literal text and variable placeholders.
+
+    Rendering only substitutes the values, without scanning the statement again:
+    - `#:VARIABLE#` is replaced by the raw value (e.g. a schema or an object name).
+    - `:VARIABLE` is replaced by a quoted literal, or by a bind parameter when
+      a `params` dictionary is given to `render`.
+    Variable names are matched case-insensitively.
+    """
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.parts = []
+        self.variables = set()
+
+        position = 0
+        for match in PLACEHOLDER.finditer(sql):
+            self.parts.append(sql[position:match.start()])
+            raw = match.group(1) is not None
+            name = (match.group(1) if raw else match.group(2)).upper()
+            self.parts.append((raw, name, match.group(0)))
+            self.variables.add(name)
+            position = match.end()
+        self.parts.append(sql[position:])
+
+    def follows_values(self, name: str) -> bool:
+        """
+        Check that all the placeholders of a variable directly follow a VALUES keyword
+        (e.g. `VALUES :DD_COLUMNS_ARRAY`), where an array of records can be sent as one row.
+        """
+        placeholders = [
+            index for index, part in enumerate(self.parts)
+            if not isinstance(part, str) and part[1] == name.upper()
+        ]
+        return bool(placeholders) and all(
+            not self.parts[index][0] and VALUES_CLAUSE.search(self.parts[index - 1])
+            for index in placeholders
+        )
+
+    @staticmethod
+    def escape(value: Any) -> str:
+        """
+        Escape a value rendered inside the statement.
+        """
+        if isinstance(value, str):
+            value = value.replace("$$", "$$$$")
+            value = value.replace("'", "''")
+        return str(value)
+
+    def render(self, variables: Dict[str, Union[str, int, float, None]], params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render the statement with the values of the variables.
+
+        Args:
+            variables (dict): The values of the variables, by name.
+            params (dict): If provided, `:VARIABLE` placeholders are rendered as bind
+                parameters and their values are added to this dictionary.
+
+        Returns:
+            str: The rendered statement. Placeholders without a value are left unchanged.
+        """
+        values = {}
+        for name, value in variables.items():
+            values.setdefault(name.upper(), value)
+
+        statement = []
+        for part in self.parts:
+            if isinstance(part, str):
+                statement.append(part)
+                continue
+
+            raw, name, placeholder = part
+            if name not in values or (values[name] is None and (raw or params is None)):
+                statement.append(placeholder)
+            elif isinstance(values[name], SQLText):
+                statement.append(values[name])
+            elif raw:
+                statement.append(self.escape(values[name]))
+            elif params is not None:
+                params[name] = values[name]
+                statement.append(f":{name}")
+            elif isinstance(values[name], str):
+                statement.append(f"'{self.escape(values[name])}'")
+            else:
+                statement.append(self.escape(values[name]))
+
+        return "".join(statement)
@@ -7,6 +7,7 @@ BASE_DIR = Path(__file__).resolve().parent
 # Define paths to configuration files
 LOGS_TEXT_PATH = BASE_DIR / "files/logs-frontend-text.log"
 LOGS_JSON_PATH = BASE_DIR / "files/logs-frontend-json.log"
+LOGS_MANIFEST_PATH = BASE_DIR / "files/logs-frontend-manifest.json"
 
 
 def get_logs_text_path():
@@ -15,4 +16,8 @@ def get_logs_text_path():
 
 def get_logs_json_path():
     """Return the absolute path to logs-frontend-json.log"""
-    return str(LOGS_JSON_PATH)
\ No newline at end of file
+    return str(LOGS_JSON_PATH)
+
+def get_logs_manifest_path():
+    """Return the absolute path to logs-frontend-manifest.json, the list of the archived log segments"""
+    return str(LOGS_MANIFEST_PATH)
\ No newline at end of file
@@ -27,6 +27,7 @@ from contextlib import asynccontextmanager
 from liberty.framework.public import get_frontend_assets_path, get_offline_assets_path, get_setup_assets_path
 from liberty.framework.services.rest_services import Rest
 from liberty.framework.services.api_services import API
+from liberty.framework.services.db_pool import PoolLeaseMiddleware
 
 
 class BackendAPI:
@@ -177,6 +178,8 @@ async def custom_http_exception_handler(request: Request, exc: HTTPException):
 backend_api = BackendAPI()
 backend_api.setup_routes(app)
 backend_api.setup_sockets(app)
+# Pools used by a request are not closed by the pool manager before its response is sent
+app.add_middleware(PoolLeaseMiddleware, db_pools=backend_api.api.db_pools)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -204,15 +207,53 @@ async def lifespan(app: FastAPI):
         logging.debug("Database properties file is missing. Setup required.")
         app.state.setup_required = True
 
+    preload = None
+    log_writer = backend_api.rest.log_writer
+    http_clients = backend_api.rest.http_clients
     try:        
         config = query_instance.load_db_properties(db_properties_path)
+        log_writer.configure(
+            batch_size=config.get("log_batch_size"),
+            flush_interval=config.get("log_flush_interval"),
+            queue_size=config.get("log_queue_size"),
+            max_bytes=config.get("log_max_bytes"),
+            max_age=config.get("log_max_age"),
+            max_segments=config.get("log_max_segments"),
+        )
+        http_clients.configure(
+            max_connections=config.get("http_max_connections"),
+            max_keepalive=config.get("http_max_keepalive"),
+            keepalive_expiry=config.get("http_keepalive_expiry"),
+            connect_timeout=config.get("http_connect_timeout"),
+            timeout=config.get("http_timeout"),
+            http2=config.get("http2"),
+        )
         await query_instance.default_pool(config)
+        if config.get("preload_pools"):
+            # Open the pools of the applications in the background, see /api/db/ready
+            preload = asyncio.create_task(query_instance.preload_pools())
+        query_instance.db_pools.start_manager(config.get("pool_manager_interval", 60))
+        if config.get("audit_async"):
+            query_instance.audit_writer.configure(
+                batch_size=config.get("audit_batch_size"),
+                flush_interval=config.get("audit_flush_interval"),
+                queue_size=config.get("audit_queue_size"),
+            )
+            query_instance.audit_writer.start()
     except Exception as e:
         logging.error(f"Database is not available")
         app.state.offline_mode = True
+    # Frontend logs are written in the background, also in offline mode
+    log_writer.start()
     yield
     print("Shutting down...")
-    await asyncio.sleep(0) 
+    await log_writer.stop()
+    await http_clients.close()
+    # Write the queued audits before the pools are closed
+    await query_instance.audit_writer.stop()
+    if preload and not preload.done():
+        preload.cancel()
+    await query_instance.db_pools.close_all_pools()
 
 
 def main():
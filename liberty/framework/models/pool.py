@@ -11,4 +11,7 @@ CLOSE_RESPONSE_DESCRIPTION = "Pool closed successfully"
 CLOSE_RESPONSE_EXAMPLE = {
     "status": "success",
     "message": "disconnected"
-} 
\ No newline at end of file
+}
+
+
+CACHE_ERROR_MESSAGE = "Failed to clear the query cache"
@@ -17,8 +17,9 @@ from liberty.framework.models.apidb import CHECKDB_ERROR_MESSAGE, CHECKDB_RESPON
 from liberty.framework.models.modules import MODULES_ERROR_MESSAGE, MODULES_RESPONSE_DESCRIPTION, MODULES_RESPONSE_EXAMPLE, ModulesResponse
 from liberty.framework.models.pool import CLOSE_ERROR_MESSAGE, CLOSE_RESPONSE_DESCRIPTION, CLOSE_RESPONSE_EXAMPLE
 from liberty.framework.models.pool import OPEN_ERROR_MESSAGE, OPEN_RESPONSE_DESCRIPTION, OPEN_RESPONSE_EXAMPLE
+from liberty.framework.models.pool import CACHE_ERROR_MESSAGE
 from liberty.framework.models.themes import THEMES_ERROR_MESSAGE, THEMES_RESPONSE_DESCRIPTION, THEMES_RESPONSE_EXAMPLE, ThemesResponse
-from liberty.framework.services.api_services import LoginType, QuerySource, QueryType, SessionMode
+from liberty.framework.services.api_services import LoginType, Pagination, QuerySource, QueryType, ResponseFormat, SessionMode
 from liberty.framework.utils.jwt import JWT
 from liberty.framework.services.rest_services import AIResponse
 from liberty.framework.models.ai import AI_ERROR_MESSAGE, AI_RESPONSE_DESCRIPTION, AI_RESPONSE_EXAMPLE
@@ -159,6 +160,14 @@ def setup_api_routes(app, controller: ApiController, jwt: JWT):
     )
     async def post_logs(req: Request):
         return await controller.push_log(req)
+
+    @router.post("/logs/bulk",
+        summary="FMW - Push logs in bulk",
+        description="Push a list of log entries to files in json and plain text format",
+        tags=["Framework"],
+    )
+    async def post_logs_bulk(req: Request):
+        return await controller.push_logs(req)
     
 
     @router.get(
@@ -230,6 +239,36 @@ def setup_api_routes(app, controller: ApiController, jwt: JWT):
     ):
         return await controller.close(req)
 
+
+    @router.get(
+        "/db/ready",
+        summary="DATABASE - Ready",
+        description="Readiness of the database pools. Returns 503 until the default pool is open and, when preload_pools is enabled, until the pools of the applications have been opened.",
+        tags=["Database"],
+    )
+    async def ready(
+        req: Request,
+    ):
+        return controller.ready(req)
+
+
+    @router.post(
+        "/db/cache/clear",
+        summary="DATABASE - Clear cache",
+        description="Remove cached query definitions (LY_QRY_FMW / LY_QRY_SQL) and column types so they are reloaded from the database.",
+        tags=["Database"],
+        responses={
+            422: response_422(),  
+            500: response_500(ErrorResponse, CACHE_ERROR_MESSAGE),
+        },
+    )
+    async def clear_cache(
+        req: Request,
+        jwt: str = Depends(jwt.is_valid_jwt),
+        pool: Optional[str] = Query(None, description="Only clear definitions resolved for this pool alias. (e.g., `default`, `libnsx1`)."),
+        query: Optional[int] = Query(None, description="Only clear definitions of this query ID. (e.g., `1`, `2`)"),
+    ):
+        return controller.clear_cache(req)
     
     @router.get(
         "/db/query",
@@ -261,6 +300,10 @@ def setup_api_routes(app, controller: ApiController, jwt: JWT):
         offset: Optional[int] = Query(0, description="The number of rows to skip before starting to fetch."),
         limit: Optional[int] = Query(1000, description="The maximum number of rows to return."),
         params: Optional[str] = Query(None, description="Additional parameters in JSON format to replace variable in a query (e.g., `[{'APPS_ID': 10}]`)."),
+        pagination: Optional[Pagination] = Query(Pagination.offset, description="The pagination mode. Valid values: `offset`, `keyset` (pages after the `cursor` returned by the previous page, for queries with an order by clause)."),
+        cursor: Optional[str] = Query(None, description="The cursor returned by the previous page, for keyset pagination."),
+        stream: Optional[bool] = Query(False, description="Stream the rows by batches instead of building the whole response in memory (e.g. for exports). Not supported with keyset pagination."),
+        format: Optional[ResponseFormat] = Query(ResponseFormat.json, description="The format of the response. Valid values: `json`, `columnar` (column names once, rows as lists of values), `ndjson` (streamed, one row per line)."),
     ):
         try:
             # Parse the string as JSON into the expected format
@@ -269,6 +312,8 @@ def setup_api_routes(app, controller: ApiController, jwt: JWT):
             # Validate the parsed filters using Pydantic
             validated_filters = FilterCondition(parsed_filters)
             return await controller.get(req)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid filters format: {str(e)}")
 
@@ -368,6 +413,34 @@ def setup_api_routes(app, controller: ApiController, jwt: JWT):
         return await controller.delete(req)
 
 
+    @router.post(
+        "/db/batch",
+        responses={
+            400: response_400("Request body cannot be empty."),
+            422: response_422(),
+        },
+        summary="QUERY - Batch",
+        description="Execute a list of insert, update and delete operations in order, in one transaction. "
+                    "Either all the operations are committed, or none if one of them fails.",
+        tags=["Query"],
+    )
+    async def batch(
+        req: Request,
+        jwt: str = Depends(jwt.is_valid_jwt),
+        source: QuerySource = Query(None, description="The source to retrieve the query definitions. Valid values: `framework`, `query`"),
+        pool: str = Query(None, description="The database pool alias to retrieve the query definitions. (e.g., `default`, `libnsx1`)"),
+        mode: SessionMode = Query(None, description="The session mode, retrieve data from framework table or pool. Valid values: `framework`, `session`"),
+        override_pool: Optional[str] = Query(None, description="Override the default pool set in the query definitions. (e.g., `default`, `libnsx1`)"),
+        body: Dict[str, Any] = Body(..., description="JSON object with the list of operations: `{\"operations\": [{\"query\": 1, \"crud\": \"POST\", \"body\": {...}}]}`.")
+):
+        if not body.get("operations"):
+            raise HTTPException(
+                status_code=400,
+                detail="Request body cannot be empty. A list of operations is required.",
+            )
+        return await controller.batch(req)
+
+
     @router.post("/db/audit/{table}/{user}",
         response_model=PostSuccessResponse,  # Specify the success response schema
         summary="QUERY - Audit",
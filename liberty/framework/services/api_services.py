@@ -1,14 +1,22 @@
 import logging
 logger = logging.getLogger(__name__)
 
+import asyncio
+import contextlib
 from enum import Enum
 import configparser
+import re
+from typing import Any, Dict, Optional
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 
 from liberty.framework.services.db_pool import DBPool, PoolConfig, DBType, PoolInterface
+from liberty.framework.database.base_dao import BaseDAO, query_cache
+from liberty.framework.database.audit import AuditWriter
 from liberty.framework.utils.jwt import JWT
 from liberty.framework.utils.encrypt import Encryption
+from liberty.framework.utils.cache import TTLCache
+from liberty.framework.utils.serializer import JSONResponse, dumps, set_serializer
 
 
 class QueryType(str, Enum):
@@ -23,6 +31,15 @@ class SessionMode(str, Enum):
     framework = "framework"
     session = "session"
 
+class Pagination(str, Enum):
+    offset = "offset"
+    keyset = "keyset"
+
+class ResponseFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+    columnar = "columnar"
+
 
 class LoginType(str, Enum):
     database = "database"
@@ -31,11 +48,37 @@ class LoginType(str, Enum):
 defaultPool = "default"
 sessionPool = "SESSION"
 
+# Settings of a pool in db.properties and their type, see API.pool_settings
+POOL_SETTINGS = {
+    "bind_variables": bool,         # Bind query variables instead of rendering them in the SQL
+    "statement_cache_size": int,    # Prepared statements kept per connection
+    "stream_batch_size": int,       # Rows fetched per batch when streaming
+    "bulk_chunk_size": int,         # Records sent per executemany for arrays of records
+    "pool_recycle": int,            # Seconds before a connection is replaced
+    "pool_pre_ping": bool,          # Test connections when they are checked out
+    "pool_max_overflow": int,       # Connections opened beyond pool_max under load
+    "pool_timeout": int,            # Seconds to wait for a free connection
+    "pool_warmup": bool,            # Open pool_min connections when the pool is created
+}
+
+# Statements writing to these tables invalidate the cached dictionaries
+DICTIONARY_TABLES = re.compile(r"\bLY_DICTIONARY(_L)?\b", re.IGNORECASE)
+
 class API:
 
     def __init__(self, jwt : JWT):
         self.db_pools = PoolInterface()
         self.jwt = jwt
+        # Dictionary rows by DD_ID, key: (pool, language)
+        self.dictionary_cache = TTLCache(ttl=300, max_size=256)
+        # Content of db.properties, see load_db_properties
+        self.db_properties = None
+        # Shared instance, the derived keys are cached
+        self.encryption = Encryption(jwt)
+        # Pools opened at startup, see preload_pools
+        self.preload = {"status": "disabled", "pools": {}}
+        # Audits written in the background, see audit
+        self.audit_writer = AuditWriter(self.db_pools, self.open_pool)
 
     def load_db_properties(self, db_properties_path) -> PoolConfig:
         # Read the properties file
@@ -44,24 +87,100 @@ class API:
 
         # Extract database configuration
         db_config = config_parser["framework"] 
-        encryption = Encryption(self.jwt)
+        self.db_properties = config_parser
         # Return as a dictionary
         return {
             "user": db_config.get("user"),
-            "password": encryption.decrypt_text(db_config.get("password")),
+            "password": self.encryption.decrypt_text(db_config.get("password")),
             "host": db_config.get("host"),
             "port": int(db_config.get("port")),
             "database": db_config.get("database"),
             "poolMin": int(db_config.get("pool_min")),
             "poolMax": int(db_config.get("pool_max")),
             "pool_alias": db_config.get("pool_alias"),
-            "replace_null": "N"
+            "replace_null": "N",
+            "query_cache_ttl": db_config.getint("query_cache_ttl", 300),
+            "query_cache_size": db_config.getint("query_cache_size", 2048),
+            "column_cache_ttl": db_config.getint("column_cache_ttl", 3600),
+            "dictionary_cache_ttl": db_config.getint("dictionary_cache_ttl", 300),
+            "serializer": db_config.get("serializer"),
+            "preload_pools": db_config.getboolean("preload_pools", False),
+            "pool_idle_timeout": db_config.getint("pool_idle_timeout", 1800),
+            "pool_manager_interval": db_config.getint("pool_manager_interval", 60),
+            "max_pools": db_config.getint("max_pools", 0),
+            "max_connections": db_config.getint("max_connections", 0),
+            "log_batch_size": db_config.getint("log_batch_size", 100),
+            "log_flush_interval": db_config.getfloat("log_flush_interval", 1.0),
+            "log_queue_size": db_config.getint("log_queue_size", 10000),
+            "log_max_bytes": db_config.getint("log_max_bytes", 10 * 1024 * 1024),
+            "log_max_age": db_config.getint("log_max_age", 86400),
+            "log_max_segments": db_config.getint("log_max_segments", 30),
+            "audit_async": db_config.getboolean("audit_async", False),
+            "audit_batch_size": db_config.getint("audit_batch_size", 100),
+            "audit_flush_interval": db_config.getfloat("audit_flush_interval", 1.0),
+            "audit_queue_size": db_config.getint("audit_queue_size", 10000),
+            "http_max_connections": db_config.getint("http_max_connections", 100),
+            "http_max_keepalive": db_config.getint("http_max_keepalive", 20),
+            "http_keepalive_expiry": db_config.getfloat("http_keepalive_expiry", 30.0),
+            "http_connect_timeout": db_config.getfloat("http_connect_timeout", 10.0),
+            "http_timeout": db_config.getfloat("http_timeout", 60.0),
+            "http2": db_config.getboolean("http2", True),
+            **self.pool_settings(defaultPool),
         }
 
+    def pool_settings(self, alias: str) -> Dict[str, Any]:
+        """
+        Get the tuning settings of a pool from db.properties.
+
+        Settings of the [framework] section apply to all pools. They can be overridden
+        for an application pool in a section named after its alias (e.g. [libnsx1]),
+        including its size (pool_min, pool_max). Settings not set use the defaults of the DAO.
+
+        Args:
+            alias (str): The alias of the pool.
+
+        Returns:
+            dict: The settings found, by name.
+        """
+        settings = {}
+        if self.db_properties is None:
+            return settings
+
+        sections = ["framework"] if alias == defaultPool else ["framework", alias]
+        for section in sections:
+            if not self.db_properties.has_section(section):
+                continue
+            db_config = self.db_properties[section]
+            for name, value_type in POOL_SETTINGS.items():
+                if name not in db_config:
+                    continue
+                if value_type is bool:
+                    settings[name] = db_config.getboolean(name)
+                else:
+                    settings[name] = db_config.getint(name)
+            if section == alias:
+                # Size of the application pool, overrides APPS_POOL_MIN and APPS_POOL_MAX
+                if "pool_min" in db_config:
+                    settings["poolMin"] = db_config.getint("pool_min")
+                if "pool_max" in db_config:
+                    settings["poolMax"] = db_config.getint("pool_max")
+        return settings
+
     async def default_pool(self, config) -> PoolConfig:
     # Read the properties file
         
         # Startup logic
+        query_cache.configure(ttl=config.get("query_cache_ttl", 300), max_size=config.get("query_cache_size", 2048))
+        self.dictionary_cache.configure(ttl=config.get("dictionary_cache_ttl", 300))
+        if config.get("serializer"):
+            set_serializer(config["serializer"])
+        # Idle application pools are closed, the default pool is never closed
+        self.db_pools.configure(
+            idle_timeout=config.get("pool_idle_timeout", 1800),
+            max_pools=config.get("max_pools", 0),
+            max_connections=config.get("max_connections", 0),
+            protected=[defaultPool],
+        )
         default_pool = DBPool(debug_mode=False)
         await default_pool.create_pool(DBType.POSTGRES, config)
         self.db_pools.add_pool(defaultPool, default_pool)
@@ -90,6 +209,17 @@ class API:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
+    def ready(self, req: Request):
+        # The server is ready when the default pool is open and the pools of the applications have been preloaded
+        ready = self.db_pools.is_pool_open(defaultPool) and self.preload["status"] != "loading"
+        return JSONResponse({
+            "status": "success" if ready else "failed",
+            "ready": ready,
+            "preload": self.preload["status"],
+            "pools": self.preload["pools"],
+            "open": list(self.db_pools.pools.keys()),
+        }, status_code=200 if ready else 503)
+
     def get_pool_info(self, req: Request, pool: str):
         try:
             pool_info = self.db_pools.get_pool(pool).db_dao.get_pool_info()
@@ -97,6 +227,31 @@ class API:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
         
+    def clear_cache(self, req: Request):
+        try:
+            pool = req.query_params.get("pool")
+            query = req.query_params.get("query")
+
+            count = BaseDAO.invalidate_query_cache(int(query) if query else None, pool)
+
+            # Column types and dictionaries are cached per pool, reload them on the next request
+            if not query:
+                for alias, db_pool in self.db_pools.pools.items():
+                    if pool is None or alias == pool:
+                        db_pool.db_dao.invalidate_column_types()
+                        db_pool.db_dao.invalidate_audit_metadata()
+                self.invalidate_dictionary(pool)
+
+            return JSONResponse({
+                "status": "success",
+                "message": f"{count} cached queries removed",
+                "cache": query_cache.stats(),
+                "dictionary": self.dictionary_cache.stats(),
+                "tokens": self.jwt.token_cache.stats(),
+            })
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
     async def get(self, req: Request):
         try:
             # Extract query parameters
@@ -108,25 +263,21 @@ class API:
                 "POOL": query_params.get("mode") == SessionMode.framework and defaultPool or query_params.get("pool"),
             }
 
-            dd_query = {"QUERY": "1", "CRUD": "GET"}
-
             # Build context
             context = {
                 "row_offset": int(query_params.get("offset", 0)),
                 "row_limit": int(query_params.get("limit", 1000)),
             }
 
-            context_ddl = {
-                "row_offset": 0,
-                "row_limit": 10000,
-                "where": {"LNG_ID": query_params.get("language", "en")},
-            }
-
             pool = query_params.get("pool", defaultPool)
 
             if "q" in query_params:
                 context["q"] = query_params["q"]
 
+            if query_params.get("pagination") == Pagination.keyset:
+                context["pagination"] = Pagination.keyset
+                context["cursor"] = query_params.get("cursor")
+
             context["where"] = {"LNG_ID": query_params.get("language", "en")}
 
             if "params" in query_params:
@@ -136,84 +287,73 @@ class API:
             if not self.db_pools.is_pool_open(request.get("POOL")):
                 await self.open_pool(defaultPool, request.get("POOL"))
 
-            # Fetch dictionary query
-            dictionary_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
-                dd_query, self.db_pools.get_pool(request.get("POOL")).db_type
+            response_format = query_params.get("format", ResponseFormat.json)
+            stream = query_params.get("type") != QueryType.Columns and (
+                query_params.get("stream", "false").lower() == "true" or response_format == ResponseFormat.ndjson
             )
-            dd_pool = dictionary_query[0][2] == sessionPool and request.get("POOL") or dictionary_query[0][2]
+            if stream and context.get("pagination") == Pagination.keyset:
+                # Streams return all the rows, there is no next page
+                raise HTTPException(status_code=400, detail="Keyset pagination is not supported with streaming")
+            data_query = None
 
-            # Fetch dictionary results
-            dd_results = await self.db_pools.get_pool(dd_pool).db_dao.get(dictionary_query, context_ddl)
-            temp_cols = []
-
-            # Fetch data query
-            if query_params.get("source") == QuerySource.Framework:
-                data_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
-                    request, self.db_pools.get_pool(request.get("POOL")).db_type
-                )
-            else:
-                data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
-                    request, self.db_pools.get_pool(pool).db_type
-                )
-
-            # Ensure data_query[0] exists and has at least 3 elements
-            if not data_query or len(data_query[0]) < 3:
-                raise ValueError("Invalid data_query structure or missing data.")
-            
-            target_pool = query_params.get("overridePool") or (
-               query_params.get("pool") if data_query[0][2]  == sessionPool else data_query[0][2]
-            )
+            async def fetch_data():
+                nonlocal data_query
 
+                # Fetch data query
+                if query_params.get("source") == QuerySource.Framework:
+                    data_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
+                        request, self.db_pools.get_pool(request.get("POOL")).db_type
+                    )
+                else:
+                    data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
+                        request, self.db_pools.get_pool(pool).db_type
+                    )
 
-   
-            # Ensure target pool is open
-            if not self.db_pools.is_pool_open(target_pool):
-                await self.open_pool(pool, target_pool)
+                # Ensure data_query[0] exists and has at least 3 elements
+                if not data_query or len(data_query[0]) < 3:
+                    raise ValueError("Invalid data_query structure or missing data.")
+                
+                target_pool = query_params.get("overridePool") or (
+                   query_params.get("pool") if data_query[0][2]  == sessionPool else data_query[0][2]
+                )
 
+                # Ensure target pool is open
+                if not self.db_pools.is_pool_open(target_pool):
+                    await self.open_pool(pool, target_pool)
 
-            # Fetch results
-            if target_pool != request.get("POOL") and query_params.get("source") != QuerySource.Framework:
-                data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
-                    request, self.db_pools.get_pool(target_pool).db_type
-                )
+                # Fetch results
+                if target_pool != request.get("POOL") and query_params.get("source") != QuerySource.Framework:
+                    data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
+                        request, self.db_pools.get_pool(target_pool).db_type
+                    )
 
-            if query_params.get("type") == QueryType.Columns:
-                if query_params.get("source") == QuerySource.Framework:
-                    results = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_metadata(data_query, context)
-                else:
-                    results = await self.db_pools.get_pool(target_pool).db_dao.get_metadata(data_query, context)
-            else:
-                if query_params.get("source") == QuerySource.Framework:
-                    results = await self.db_pools.get_pool(request.get("POOL")).db_dao.get(data_query, context)
-                else:
-                    results = await self.db_pools.get_pool(target_pool).db_dao.get(data_query, context)
+                data_pool = request.get("POOL") if query_params.get("source") == QuerySource.Framework else target_pool
+                db_dao = self.db_pools.get_pool(data_pool).db_dao
+                if stream:
+                    return db_dao, None
+                if query_params.get("type") == QueryType.Columns:
+                    return db_dao, await db_dao.get_metadata(data_query, context)
+                return db_dao, await db_dao.get(data_query, context, response_format == ResponseFormat.columnar)
+
+            # The dictionary (cached) and the data do not depend on each other, fetch them concurrently
+            dictionary_task = asyncio.ensure_future(
+                self.get_dictionary(request.get("POOL"), query_params.get("language", "en"))
+            )
+            try:
+                db_dao, results = await fetch_data()
+                dictionary = await dictionary_task
+            finally:
+                # Not left running, or failing unobserved, when the data cannot be fetched
+                dictionary_task.cancel()
+                await asyncio.wait([dictionary_task])
+                if not dictionary_task.cancelled():
+                    dictionary_task.exception()
+
+            if stream:
+                return await self.stream(db_dao, data_query, context, dictionary, response_format)
 
             # Process metadata
-            for val in results["meta_data"]:
-                index_field = next(
-                    (i for i, x in enumerate(dd_results["rows"]) if x["DD_ID"] == val["name"].upper()), -1
-                )
-                if index_field > -1:
-                    temp_cols.append({
-                        "headerName": dd_results["rows"][index_field]["DD_LABEL"],
-                        "field": dd_results["rows"][index_field]["DD_ID"].upper(),
-                        "type": dd_results["rows"][index_field]["DD_TYPE"],
-                        "operator": "=" if dd_results["rows"][index_field]["DD_TYPE"] != "text" else "like",
-                        "rules": dd_results["rows"][index_field]["DD_RULES"],
-                        "rules_values": dd_results["rows"][index_field]["DD_RULES_VALUES"],
-                        "default": dd_results["rows"][index_field]["DD_DEFAULT"],
-                    })
-                else:
-                    temp_cols.append({
-                        "headerName": val["name"].upper(),
-                        "field": val["name"].upper(),
-                        "type": "text",
-                        "operator": "like",
-                        "rules": None,
-                        "rules_values": None,
-                        "default": None,
-                    })
-
+            temp_cols = self.build_metadata(results["meta_data"], dictionary)
 
             # Construct the response
             if query_params.get("type") == QueryType.Columns:
@@ -227,15 +367,25 @@ class API:
                     "count": len(temp_cols),
                 })
             else:
-                return JSONResponse({
+                response = {
                     "items": results["rows"],
                     "status": "success",
                     "metadata": temp_cols,
-                    "hasMore": len(results["rows"]) == context["row_limit"],
+                    # Keyset pages have a cursor only when rows follow
+                    "hasMore": results["cursor"] is not None if "cursor" in results else len(results["rows"]) == context["row_limit"],
                     "limit": context["row_limit"],
-                    "offset": context["row_offset"],
+                    "offset": results.get("offset", context["row_offset"]),
                     "count": len(results["rows"]),
-                })
+                }
+                if response_format == ResponseFormat.columnar:
+                    # Column names once, then one list of values per row
+                    response = {"columns": results["columns"], **response}
+                if "cursor" in results:
+                    # Keyset pagination: cursor of the next page
+                    response["cursor"] = results["cursor"]
+                return JSONResponse(response)
+        except HTTPException:
+            raise
         except Exception as err:
             message = str(err)
             return JSONResponse({
@@ -249,6 +399,247 @@ class API:
             })
         
 
+    async def get_dictionary(self, pool: str, language: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the dictionary (LY_DICTIONARY) used by a pool for a language, indexed by DD_ID.
+        The dictionary is cached and shared by all requests, see `clear_cache`.
+
+        Args:
+            pool (str): The pool of the request.
+            language (str): The language of the labels.
+
+        Returns:
+            dict: The rows of the dictionary by DD_ID.
+        """
+        dictionary = self.dictionary_cache.get((pool, language))
+        if dictionary is not None:
+            return dictionary
+
+        dd_query = {"QUERY": "1", "CRUD": "GET"}
+        context_ddl = {
+            "row_offset": 0,
+            "row_limit": 10000,
+            "where": {"LNG_ID": language},
+        }
+
+        # Fetch dictionary query
+        dictionary_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
+            dd_query, self.db_pools.get_pool(pool).db_type
+        )
+        dd_pool = dictionary_query[0][2] == sessionPool and pool or dictionary_query[0][2]
+
+        # Fetch dictionary results
+        dd_results = await self.db_pools.get_pool(dd_pool).db_dao.get(dictionary_query, context_ddl)
+
+        dictionary = {}
+        for row in dd_results["rows"]:
+            dictionary.setdefault(row["DD_ID"], row)
+        self.dictionary_cache.set((pool, language), dictionary)
+        return dictionary
+
+    def invalidate_dictionary(self, pool: Optional[str] = None) -> int:
+        """
+        Remove the cached dictionaries of a pool (default: all pools).
+        """
+        return self.dictionary_cache.invalidate(lambda key: pool is None or key[0] == pool)
+
+    def build_metadata(self, meta_data, dictionary: Dict[str, Dict[str, Any]]):
+        """
+        Build the column definitions of a query result from the dictionary.
+
+        Args:
+            meta_data (list): The columns of the result (name, type).
+            dictionary (dict): The dictionary for the language of the request, by DD_ID.
+
+        Returns:
+            list: The column definitions (header, field, type, operator, rules, default).
+        """
+        temp_cols = []
+        for val in meta_data:
+            dd_row = dictionary.get(val["name"].upper())
+            if dd_row is not None:
+                temp_cols.append({
+                    "headerName": dd_row["DD_LABEL"],
+                    "field": dd_row["DD_ID"].upper(),
+                    "type": dd_row["DD_TYPE"],
+                    "operator": "=" if dd_row["DD_TYPE"] != "text" else "like",
+                    "rules": dd_row["DD_RULES"],
+                    "rules_values": dd_row["DD_RULES_VALUES"],
+                    "default": dd_row["DD_DEFAULT"],
+                })
+            else:
+                temp_cols.append({
+                    "headerName": val["name"].upper(),
+                    "field": val["name"].upper(),
+                    "type": "text",
+                    "operator": "like",
+                    "rules": None,
+                    "rules_values": None,
+                    "default": None,
+                })
+        return temp_cols
+
+    async def stream(self, db_dao: BaseDAO, data_query, context, dictionary: Dict[str, Dict[str, Any]], response_format: str = ResponseFormat.json):
+        """
+        Stream the result of a query, fetched by batches, instead of building the whole response in memory.
+
+        Args:
+            db_dao (BaseDAO): The DAO of the pool executing the query.
+            data_query: The query definition.
+            context (dict): The context of the query (filters, variables, offset and limit).
+            dictionary (dict): The dictionary for the language of the request, by DD_ID.
+            response_format (str): `json` for the same document as a regular query,
+                `columnar` for the same document with rows as lists of values,
+                `ndjson` for the metadata, then one row per line, then the status.
+
+        Returns:
+            StreamingResponse: The streamed result.
+        """
+        columnar = response_format == ResponseFormat.columnar
+        rows = db_dao.stream(data_query, context, columnar=columnar)
+        # Execute the query before starting the response, so that errors are returned as usual
+        columns = await anext(rows)
+        metadata = self.build_metadata([{"name": name} for name in columns], dictionary)
+        ndjson = response_format == ResponseFormat.ndjson
+
+        async def content():
+            count = 0
+            status = {"status": "success"}
+            if ndjson:
+                yield dumps({"metadata": metadata}) + b"\n"
+            elif columnar:
+                yield b'{"columns":' + dumps(columns) + b',"items":['
+            else:
+                yield b'{"items":['
+            try:
+                async for batch in rows:
+                    if ndjson:
+                        yield b"".join(dumps(row) + b"\n" for row in batch)
+                    else:
+                        yield (b"," if count else b"") + b",".join(dumps(row) for row in batch)
+                    count += len(batch)
+            except Exception as err:
+                # The response has already started, the error is reported in the status
+                status = {"status": "error", "message": f"Error: {str(err)}"}
+            finally:
+                await rows.aclose()
+
+            trailer = {
+                **status,
+                "hasMore": count == context["row_limit"],
+                "limit": context["row_limit"],
+                "offset": context["row_offset"],
+                "count": count,
+            }
+            if ndjson:
+                yield dumps(trailer) + b"\n"
+            else:
+                yield b'],"metadata":' + dumps(metadata) + b"," + dumps(trailer)[1:]
+
+        return StreamingResponse(content(), media_type="application/x-ndjson" if ndjson else "application/json")
+
+    async def get_write_query(self, request: Dict[str, Any], source: Optional[str], pool: str, override_pool: Optional[str] = None):
+        """
+        Get the query of a POST, PUT or DELETE request, and the pool to execute it on (opened if needed).
+
+        Args:
+            request (dict): The query (QUERY, CRUD, POOL).
+            source (str): The source of the query definition (framework or query).
+            pool (str): The pool of the request.
+            override_pool (str): The pool to use instead of the pool of the query definition.
+
+        Returns:
+            tuple: The query, and the alias of the target pool.
+        """
+        # Determine the data query
+        if source == QuerySource.Framework:
+            data_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
+                request, self.db_pools.get_pool(request.get("POOL")).db_type
+            )
+        else:
+            data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
+                request, self.db_pools.get_pool(pool).db_type
+            )
+
+        # Determine the target pool
+        target_pool = override_pool or (
+            pool if data_query[0][2] == sessionPool else data_query[0][2]
+        )
+
+        # Ensure the target pool is open
+        if not self.db_pools.is_pool_open(target_pool):
+            await self.open_pool(pool, target_pool)
+
+        # If the target pool differs from the request pool, adjust the query
+        if target_pool != request.get("POOL"):
+            if source == QuerySource.Framework:
+                data_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
+                    request, self.db_pools.get_pool(target_pool).db_type
+                )
+            else:
+                data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
+                    request, self.db_pools.get_pool(target_pool).db_type
+                )
+
+        return data_query, target_pool
+
+    async def batch(self, req: Request):
+        """
+        Execute a list of POST, PUT and DELETE operations in one transaction on one pool.
+        Each operation has a query ID, a method (crud) and a body, the operations are executed in order
+        and are all rolled back if one of them fails.
+        """
+        try:
+            data = await req.json()
+            operations = data.get("operations") if isinstance(data, dict) else data
+            if not isinstance(operations, list) or not operations:
+                raise ValueError("A list of operations is required")
+
+            pool = req.query_params.get("pool", defaultPool)
+            source = req.query_params.get("source")
+            override_pool = req.query_params.get("overridePool")
+
+            batch = []
+            target_pool = None
+            for operation in operations:
+                crud = str(operation.get("crud", "POST")).upper()
+                if crud not in ("POST", "PUT", "DELETE"):
+                    raise ValueError(f"Invalid operation {crud}, expected POST, PUT or DELETE")
+                request = {
+                    "QUERY": operation.get("query"),
+                    "CRUD": crud,
+                    "POOL": defaultPool if req.query_params.get("mode") == SessionMode.framework else req.query_params.get("pool"),
+                }
+                data_query, operation_pool = await self.get_write_query(
+                    request, operation.get("source", source), pool, override_pool
+                )
+                # One transaction, on one pool
+                if target_pool is not None and operation_pool != target_pool:
+                    raise ValueError(f"All the operations must run on the same pool ({target_pool}, {operation_pool})")
+                target_pool = operation_pool
+                batch.append((data_query, {"body": operation.get("body") or {}}))
+
+            results = await self.db_pools.get_pool(target_pool).db_dao.batch(batch)
+            if any(DICTIONARY_TABLES.search(data_query[0][0]) for data_query, _ in batch):
+                self.invalidate_dictionary()
+
+            return JSONResponse({
+                "items": [
+                    {"query": operation.get("query"), "crud": str(operation.get("crud", "POST")).upper(), **result}
+                    for operation, result in zip(operations, results)
+                ],
+                "status": "success",
+                "count": sum(result["count"] for result in results),
+            })
+
+        except Exception as err:
+            message = str(err)
+            return JSONResponse({
+                "items": [{"message": f"Error: {message}"}],
+                "status": "error",
+                "count": 0
+            })
+
     async def post(self, req: Request):
         try:
             request = {
@@ -261,44 +652,24 @@ class API:
             pool = req.query_params.get("pool", defaultPool)
             results = None
 
-            # Determine the data query
-            if req.query_params.get("source") == QuerySource.Framework:
-                data_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
-                    request, self.db_pools.get_pool(request.get("POOL")).db_type
-                )
-            else:
-                data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
-                    request, self.db_pools.get_pool(pool).db_type
-                )
-
-            # Determine the target pool
-            target_pool = req.query_params.get("overridePool") or (
-                req.query_params.get("pool") if data_query[0][2] == sessionPool else data_query[0][2]
+            data_query, target_pool = await self.get_write_query(
+                request, req.query_params.get("source"), pool, req.query_params.get("overridePool")
             )
 
-            # Ensure the target pool is open
-            if not self.db_pools.is_pool_open(target_pool):
-                await self.open_pool(pool, target_pool)
-
-            # If the target pool differs from the request pool, adjust the query
-            if target_pool != request.get("POOL"):
-                if req.query_params.get("source") == QuerySource.Framework:
-                    data_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
-                        request, self.db_pools.get_pool(target_pool).db_type
-                    )
-                else:
-                    data_query = await self.db_pools.get_pool(request.get("POOL")).db_dao.get_query(
-                        request, self.db_pools.get_pool(target_pool).db_type
-                    )
-
             # Execute the query
             results = await self.db_pools.get_pool(target_pool).db_dao.post(data_query, context)
+            if DICTIONARY_TABLES.search(data_query[0][0]):
+                self.invalidate_dictionary()
             # Return the response
-            return JSONResponse({
+            response = {
                 "items": results["rows"],
                 "status": "success",
                 "count": results["count"]
-            })
+            }
+            if "chunks" in results:
+                # Rows written by each chunk of a bulk write
+                response["chunks"] = results["chunks"]
+            return JSONResponse(response)
 
         except Exception as err:
             message = str(err)
@@ -327,60 +698,112 @@ class API:
 
     async def open_pool(self, framework_pool: str, target_pool: str):
         try:
-            request = {
-            "QUERY": "2",
-            "CRUD": "GET",
-        }
+            # Concurrent requests for the same pool wait for a single creation
+            async with self.db_pools.lock(target_pool):
+                if self.db_pools.is_pool_open(target_pool):
+                    return
+
+                request = {
+                    "QUERY": "2",
+                    "CRUD": "GET",
+                }
 
-            context = {
-                "where": {
-                    "APPS_POOL": target_pool,
-                },
-                "row_offset": 0,
-                "row_limit": 1000,
-            }
+                context = {
+                    "where": {
+                        "APPS_POOL": target_pool,
+                    },
+                    "row_offset": 0,
+                    "row_limit": 1000,
+                }
 
-            # Fetch the target query from the framework query
-            target_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
-                request, self.db_pools.get_pool(defaultPool).db_type
-            )
+                # Fetch the target query from the framework query
+                target_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
+                    request, self.db_pools.get_pool(defaultPool).db_type
+                )
 
-            # Fetch the results from the database
-            results = await self.db_pools.get_pool(framework_pool).db_dao.get(target_query, context)
+                # Fetch the results from the database
+                results = await self.db_pools.get_pool(framework_pool).db_dao.get(target_query, context)
             
-            # Check if results are returned
-            if len(results["rows"]) > 0:
-                app_pool = results["rows"][0]["APPS_POOL"]
-
-                # Check if the pool is already open
-                if not self.db_pools.is_pool_open(app_pool):
-                    # Create a new DBPool instance
-                    new_pool = DBPool()
-                    encryption = Encryption(self.jwt)
-                    # Fetch the connection details
-                    pool_config = {
-                        "user": results["rows"][0]["APPS_USER"],
-                        "password": encryption.decrypt_text(results["rows"][0]["APPS_PASSWORD"]),
-                        "connectString": f"{results['rows'][0]['APPS_HOST']}:{results['rows'][0]['APPS_PORT']}/{results['rows'][0]['APPS_DATABASE']}",
-                        "host": results["rows"][0]["APPS_HOST"],
-                        "port": results["rows"][0]["APPS_PORT"],
-                        "database": results["rows"][0]["APPS_DATABASE"],
-                        "poolMin": results["rows"][0]["APPS_POOL_MIN"],
-                        "poolMax": results["rows"][0]["APPS_POOL_MAX"],
-                        "poolIncrement": 1,
-                        "pool_alias": app_pool,
-                        "replace_null": results["rows"][0]["APPS_REPLACE_NULL"],
-                    }
-                    # Create the pool
-                    await new_pool.create_pool(results["rows"][0]["APPS_DBTYPE"], pool_config)
-                    self.db_pools.add_pool(app_pool, new_pool)
-            else:
-                raise ValueError(f"Requested pool {target_pool} not found")
+                # Check if results are returned
+                if len(results["rows"]) > 0:
+                    app_pool = results["rows"][0]["APPS_POOL"]
+
+                    async with contextlib.AsyncExitStack() as stack:
+                        # The pool is registered under the alias of the application, locked as well when it differs
+                        if app_pool != target_pool:
+                            await stack.enter_async_context(self.db_pools.lock(app_pool))
+
+                        # Check if the pool is already open
+                        if not self.db_pools.is_pool_open(app_pool):
+                            # Create a new DBPool instance
+                            new_pool = DBPool()
+                            # Fetch the connection details
+                            pool_config = {
+                                "user": results["rows"][0]["APPS_USER"],
+                                "password": self.encryption.decrypt_text(results["rows"][0]["APPS_PASSWORD"]),
+                                "connectString": f"{results['rows'][0]['APPS_HOST']}:{results['rows'][0]['APPS_PORT']}/{results['rows'][0]['APPS_DATABASE']}",
+                                "host": results["rows"][0]["APPS_HOST"],
+                                "port": results["rows"][0]["APPS_PORT"],
+                                "database": results["rows"][0]["APPS_DATABASE"],
+                                "poolMin": results["rows"][0]["APPS_POOL_MIN"],
+                                "poolMax": results["rows"][0]["APPS_POOL_MAX"],
+                                "poolIncrement": 1,
+                                "pool_alias": app_pool,
+                                "replace_null": results["rows"][0]["APPS_REPLACE_NULL"],
+                                **self.pool_settings(app_pool),
+                            }
+                            # Close unused pools if the limits of the pool manager are reached
+                            await self.db_pools.reserve(
+                                int(pool_config["poolMax"] or 0) + int(pool_config.get("pool_max_overflow") or 0)
+                            )
+                            # Create the pool
+                            await new_pool.create_pool(results["rows"][0]["APPS_DBTYPE"], pool_config)
+                            self.db_pools.add_pool(app_pool, new_pool)
+                else:
+                    raise ValueError(f"Requested pool {target_pool} not found")
 
         except Exception as err: 
             raise RuntimeError(f"{str(err)}")  
             
 
+    async def preload_pools(self):
+        """
+        Open the pools of all the applications (LY_APPLICATIONS) concurrently, so that the first
+        request of each application does not wait for the pool creation.
+        Enabled with preload_pools = true in db.properties, the progress is reported by `ready`.
+        """
+        self.preload = {"status": "loading", "pools": {}}
+        try:
+            request = {
+                "QUERY": 15,
+                "POOL": defaultPool,
+                "CRUD": "GET",
+            }
+            context = {
+                "row_offset": 0,
+                "row_limit": 1000,
+            }
+            target_query = await self.db_pools.get_pool(defaultPool).db_dao.get_framework_query(
+                request, self.db_pools.get_pool(defaultPool).db_type
+            )
+            results = await self.db_pools.get_pool(defaultPool).db_dao.get(target_query, context)
+            aliases = {row["APPS_POOL"] for row in results["rows"] if row.get("APPS_POOL") and row["APPS_POOL"] != defaultPool}
+
+            async def preload_pool(alias: str):
+                self.preload["pools"][alias] = "loading"
+                try:
+                    await self.open_pool(defaultPool, alias)
+                    self.preload["pools"][alias] = "ready"
+                except Exception as err:
+                    # The pool is opened again on the first request of the application
+                    logger.warning(f"Pool {alias} could not be preloaded: {str(err)}")
+                    self.preload["pools"][alias] = "failed"
+
+            await asyncio.gather(*(preload_pool(alias) for alias in sorted(aliases)))
+        except Exception as err:
+            logger.error(f"Pools could not be preloaded: {str(err)}")
+        self.preload["status"] = "ready"
+
     async def close(self, req: Request):
         try:
             pool = req.query_params.get("pool")
@@ -397,15 +820,16 @@ class API:
 
     async def close_pool(self, pool: str):
         try:
-            if self.db_pools.is_pool_open(pool):
-                await self.db_pools.get_pool(pool).close_pool()
-                self.db_pools.remove_pool(pool)
-                return JSONResponse({
-                    "status": "success",
-                    "message": "disconnected"
-                })
-            else:
-                raise ValueError(f"Requested pool {pool} not found")
+            async with self.db_pools.lock(pool):
+                if self.db_pools.is_pool_open(pool):
+                    await self.db_pools.get_pool(pool).close_pool()
+                    self.db_pools.remove_pool(pool)
+                    return JSONResponse({
+                        "status": "success",
+                        "message": "disconnected"
+                    })
+                else:
+                    raise ValueError(f"Requested pool {pool} not found")
 
         except Exception as err:
             logger.error(f"Error closing pool")
@@ -498,11 +922,9 @@ class API:
                     "message": "loginError",
                 }
 
-            encryption = Encryption(self.jwt)
-
             # Validate the password
-            encryption = Encryption(self.jwt)
-            if encryption.decrypt_text(results["rows"][0]["USR_PASSWORD"]) == encryption.decrypt_text(password):
+            stored_password, given_password = self.encryption.decrypt_many([results["rows"][0]["USR_PASSWORD"], password])
+            if stored_password == given_password:
                 return {
                     "items": results["rows"],
                     "status": "success",
@@ -722,8 +1144,8 @@ class API:
             if not is_pool_open:
                 await self.open_pool(pool, target_pool)
 
-            # Perform the audit operation
-            await self.db_pools.get_pool(target_pool).db_dao.audit(table, user, context)
+            # Perform the audit operation, queued when audit_async is enabled
+            await self.audit_writer.audit(pool, target_pool, table, user, context)
 
             return {
                 "items": [{}],
@@ -1,5 +1,11 @@
 import logging
 logger = logging.getLogger(__name__)
+import asyncio
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, List
 from liberty.framework.database.pg_dao import PostgresDAO
 from liberty.framework.database.ora_dao import OracleDAO
 from liberty.framework.utils.common import PoolConfig
@@ -12,31 +18,193 @@ class PoolInterface:
     def __init__(self):
         # A dictionary to store DBPool instances by alias
         self.pools = {}
+        # Locks serializing the opening and closing of each alias, kept while they are held or awaited
+        self.locks = weakref.WeakValueDictionary()
+        # Last use of each pool (monotonic time), updated by get_pool
+        self.last_used = {}
+        # Number of leases held on each pool, and the aliases leased by the current request (see lease)
+        self.leases = {}
+        self.leased = ContextVar(f"leased_pools_{id(self)}", default=None)
+        # Limits applied by the pool manager, 0 means no limit (see configure)
+        self.idle_timeout = 0
+        self.max_pools = 0
+        self.max_connections = 0
+        self.protected = set()
+        self.manager = None
+
+    def lock(self, alias: str) -> asyncio.Lock:
+        """Get the lock of an alias, held while the pool is opened or closed."""
+        lock = self.locks.get(alias)
+        if lock is None:
+            lock = asyncio.Lock()
+            self.locks[alias] = lock
+        return lock
+
+    @contextmanager
+    def lease(self):
+        """
+        Lease the pools used within the block, typically a request: the pools returned by
+        get_pool are not closed by the manager until the block exits, even between two sessions.
+        """
+        aliases = set()
+        token = self.leased.set(aliases)
+        try:
+            yield aliases
+        finally:
+            self.leased.reset(token)
+            for alias in aliases:
+                count = self.leases.get(alias, 0) - 1
+                if count > 0:
+                    self.leases[alias] = count
+                else:
+                    self.leases.pop(alias, None)
+
+    def hold(self, alias: str):
+        """Add a pool to the lease of the current request, if any."""
+        aliases = self.leased.get()
+        if aliases is not None and alias not in aliases:
+            aliases.add(alias)
+            self.leases[alias] = self.leases.get(alias, 0) + 1
+
+    def configure(self, idle_timeout: int = 0, max_pools: int = 0, max_connections: int = 0, protected: Iterable[str] = ()):
+        """
+        Configure the pool manager.
+
+        Args:
+            idle_timeout (int): Seconds without use after which a pool is closed.
+            max_pools (int): Maximum number of open pools.
+            max_connections (int): Maximum number of connections of all the open pools.
+            protected: Aliases of the pools that are never closed by the manager.
+        """
+        self.idle_timeout = idle_timeout
+        self.max_pools = max_pools
+        self.max_connections = max_connections
+        self.protected = set(protected)
 
     def add_pool(self, alias: str, db_pool: "DBPool"):
         """Add a new DBPool instance to the interface."""
         self.pools[alias] = db_pool
+        self.last_used[alias] = time.monotonic()
+        self.hold(alias)
 
     def remove_pool(self, alias: str):
         """Remove pool instance."""
         if alias in self.pools:
             self.pools.pop(alias)
+        self.last_used.pop(alias, None)
 
     def get_pool(self, alias: str) -> "DBPool":
         """Retrieve a DBPool instance by alias."""
         if alias not in self.pools:
             raise ValueError(f"Pool with alias '{alias}' not found.")
+        self.last_used[alias] = time.monotonic()
+        self.hold(alias)
         return self.pools[alias]
 
-    def close_all_pools(self):
-        """Close all pools in the interface."""
-        for alias, db_pool in self.pools.items():
-            db_pool.close_pool()
+    def evictable_pools(self) -> List[str]:
+        """Aliases of the pools the manager can close, least recently used first."""
+        aliases = [
+            alias for alias, db_pool in self.pools.items()
+            if alias not in self.protected and not self.leases.get(alias) and not db_pool.in_use()
+        ]
+        return sorted(aliases, key=lambda alias: self.last_used.get(alias, 0))
+
+    async def evict_pool(self, alias: str):
+        """Close a pool and remove it from the interface."""
+        async with self.lock(alias):
+            db_pool = self.pools.get(alias)
+            if db_pool is None:
+                return
+            # Removed first, requests arriving during the close open a new pool
+            self.remove_pool(alias)
+            await db_pool.close_pool()
+            logger.info(f"Pool {alias} closed by the pool manager")
+
+    async def evict_idle_pools(self):
+        """Close the pools that have not been used for idle_timeout seconds."""
+        if not self.idle_timeout:
+            return
+        limit = time.monotonic() - self.idle_timeout
+        for alias in self.evictable_pools():
+            if self.last_used.get(alias, 0) < limit:
+                await self.evict_pool(alias)
+
+    async def reserve(self, connections: int):
+        """
+        Make room for a new pool of `connections` connections, closing the least recently used
+        pools when max_pools or max_connections would be exceeded.
+
+        Raises:
+            RuntimeError: If the limits are still exceeded once all the unused pools are closed.
+        """
+        def exceeded() -> bool:
+            return (
+                (self.max_pools and len(self.pools) + 1 > self.max_pools) or
+                (self.max_connections and self.connections() + connections > self.max_connections)
+            )
+
+        for alias in self.evictable_pools():
+            if not exceeded():
+                break
+            await self.evict_pool(alias)
+        if exceeded():
+            raise RuntimeError(f"Too many open pools ({len(self.pools)} pools, {self.connections()} connections)")
+
+    def connections(self) -> int:
+        """Maximum number of connections of all the open pools."""
+        return sum(db_pool.max_connections() for db_pool in self.pools.values())
+
+    async def run_manager(self, interval: int):
+        """Close the idle pools every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle_pools()
+            except Exception as e:
+                logger.error(f"Pool manager failed: {str(e)}")
+
+    def start_manager(self, interval: int = 60):
+        """Start the background task closing the idle pools."""
+        if self.manager is None and self.idle_timeout:
+            self.manager = asyncio.create_task(self.run_manager(interval))
+
+    async def close_all_pools(self):
+        """Stop the pool manager and close all pools in the interface."""
+        if self.manager is not None:
+            self.manager.cancel()
+            self.manager = None
+        for alias in list(self.pools.keys()):
+            async with self.lock(alias):
+                db_pool = self.pools.get(alias)
+                if db_pool is None:
+                    continue
+                self.remove_pool(alias)
+                try:
+                    await db_pool.close_pool()
+                except Exception as e:
+                    logger.error(f"Error closing pool {alias}: {str(e)}")
 
     def is_pool_open(self, alias: str) -> bool:
         """Check if a pool is open (exists in the interface)."""
         return alias in self.pools
 
+class PoolLeaseMiddleware:
+    """
+    ASGI middleware holding a lease on the pools used by each HTTP request until its response,
+    streamed or not, has been sent. See PoolInterface.lease.
+    """
+
+    def __init__(self, app, db_pools: PoolInterface):
+        self.app = app
+        self.db_pools = db_pools
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with self.db_pools.lease():
+            await self.app(scope, receive, send)
+
 class DBPool:
     def __init__(self, debug_mode: bool = False):
         self.debug_mode = debug_mode
@@ -56,8 +224,20 @@ class DBPool:
             await self.db_dao.create_engine()
 
         except Exception as e:
+            # Dispose of the engine if it was created before the connection test failed
+            await self.close_pool()
             raise RuntimeError(f"Error creating pool: {str(e)}")
 
+    def in_use(self) -> bool:
+        """Check if connections of the pool are checked out."""
+        return bool(self.db_dao and self.db_dao.engine and self.db_dao.engine.pool.checkedout() > 0)
+
+    def max_connections(self) -> int:
+        """Maximum number of connections the pool can open."""
+        if not self.db_dao:
+            return 0
+        return int(self.db_dao.config.get("poolMax") or 0) + int(self.db_dao.config.get("pool_max_overflow") or 0)
+
     async def close_pool(self):
-        if self.db_dao:
+        if self.db_dao and self.db_dao.engine:
             await self.db_dao.close_pool()
\ No newline at end of file
@@ -1,4 +1,5 @@
 # Description: API REST service for handling REST API requests.
+import asyncio
 import importlib
 import logging
 logger = logging.getLogger(__name__)
@@ -7,17 +8,16 @@ import re
 from urllib.parse import urljoin, urlparse
 
 from fastapi.responses import JSONResponse
-import httpx
 from pydantic import BaseModel
 
 
 import json
 from fastapi import Request, HTTPException
 from datetime import datetime, timezone
-from liberty.framework.utils.logs import LogHandler
-from liberty.framework.logs import get_logs_json_path, get_logs_text_path
+from liberty.framework.utils.http import HttpClients
+from liberty.framework.utils.logs import LogHandler, LogView, LogWriter
+from liberty.framework.logs import get_logs_json_path, get_logs_manifest_path, get_logs_text_path
 from liberty.framework.services.api_services import API, SessionMode
-from liberty.framework.utils.encrypt import Encryption
 
 defaultPool = "default"
 
@@ -33,7 +33,10 @@ class AIResponse(BaseModel):
 class Rest:
     def __init__(self, api: API):
         self.logs_handler = LogHandler()
+        self.log_writer = LogWriter(get_logs_text_path(), get_logs_json_path(), get_logs_manifest_path())
         self.api = api
+        # Outbound clients of the APIs and the AI module, see HttpClients
+        self.http_clients = HttpClients()
 
     async def call_rest(self, req: Request):
         try:
@@ -70,8 +73,7 @@ class Rest:
             user = row.get("API_USER")
             password = row.get("API_PASSWORD")
             if password:
-                encryption = Encryption(self.api.jwt)
-                password = encryption.decrypt_text(password)
+                password = self.api.encryption.decrypt_text(password)
             body = row.get("API_BODY")
 
             # Convert API_BODY from JSON string format to a Python dictionary
@@ -100,24 +102,24 @@ class Rest:
                     raise ValueError(f"Invalid external URL: {url}")
 
             # 🔹 Make the API call
-            async with httpx.AsyncClient(timeout=60.0,  verify=False) as client:
-                if method.upper() == "GET":
-                    if user and password:
-                        response = await client.get(full_url, params=parsed_body, auth=(user, password))
-                    else:
-                        response = await client.get(full_url, params=parsed_body)
+            client = self.http_clients.get(full_url, verify=False)
+            if method.upper() == "GET":
+                if user and password:
+                    response = await client.get(full_url, params=parsed_body, auth=(user, password))
                 else:
-                    if user and password:
-                        response = await client.post(full_url, json=parsed_body, auth=(user, password))
-                    else:
-                        response = await client.post(full_url, json=parsed_body)
-                if response.status_code == 200:
-                    response_data = response.json()
+                    response = await client.get(full_url, params=parsed_body)
+            else:
+                if user and password:
+                    response = await client.post(full_url, json=parsed_body, auth=(user, password))
                 else:
-                    response_data = {
-                        "error": f"Failed request with status code {response.status_code}",
-                        "details": response.text
-                    }
+                    response = await client.post(full_url, json=parsed_body)
+            if response.status_code == 200:
+                response_data = response.json()
+            else:
+                response_data = {
+                    "error": f"Failed request with status code {response.status_code}",
+                    "details": response.text
+                }
             response_data = response.json()
 
             return JSONResponse({
@@ -138,29 +140,55 @@ class Rest:
         
 
 
+    def format_log(self, log_data: dict):
+        """
+        Format a log entry as the lines of the text and JSON log files.
+        """
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        # Text log
+        text_log = (
+            f"[{timestamp}] [{log_data['level']}] {log_data['transactionName']} - {log_data['message']}\n"
+            f"Method: {log_data['method']}, URL: {log_data['url']}\n"
+            f"Category: {log_data['category']}, Feature: {log_data['feature']}, IsException: {log_data['isException']}\n\n"
+        )
+
+        # JSON log
+        json_log = json.dumps({"timestamp": timestamp, **log_data})
+        return text_log, json_log + "\n"
+
     async def push_log(self, req: Request):
         """
         Push log data to log files.
         """
         try:
             log_data = await req.json()
+            await self.log_writer.put([self.format_log(log_data)])
 
-            timestamp = datetime.now(timezone.utc).isoformat()
-
-            # Text log
-            text_log = (
-                f"[{timestamp}] [{log_data['level']}] {log_data['transactionName']} - {log_data['message']}\n"
-                f"Method: {log_data['method']}, URL: {log_data['url']}\n"
-                f"Category: {log_data['category']}, Feature: {log_data['feature']}, IsException: {log_data['isException']}\n\n"
-            )
-            with open(get_logs_text_path(), "a") as text_file:
-                text_file.write(text_log)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Log queue is full, retry later")
+        except Exception as e:
+            logger.exception(str(e))
+            raise HTTPException(status_code=500, detail=f"Failed to write logs: {str(e)}")
 
-            # JSON log
-            json_log = json.dumps({"timestamp": timestamp, **log_data})
-            with open(get_logs_json_path(), "a") as json_file:
-                json_file.write(json_log + "\n")
+    async def push_logs(self, req: Request):
+        """
+        Push a list of log entries to log files.
+        """
+        try:
+            logs_data = await req.json()
+            if not isinstance(logs_data, list):
+                raise HTTPException(status_code=400, detail="A list of log entries is expected")
+            await self.log_writer.put([self.format_log(log_data) for log_data in logs_data])
+            return JSONResponse({
+                "status": "success",
+                "count": len(logs_data),
+            })
 
+        except HTTPException:
+            raise
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Log queue is full, retry later")
         except Exception as e:
             logger.exception(str(e))
             raise HTTPException(status_code=500, detail=f"Failed to write logs: {str(e)}")
@@ -168,6 +196,8 @@ class Rest:
     async def get_log(self, req: Request):
         """
         Get logs in the specified format with optional filtering.
+        Without `limit`, the JSON and text formats return all the matching logs (read from the
+        whole file); the HTML format and `limit` read one page.
         
         Args:
             req (Request): The incoming HTTP request.
@@ -179,35 +209,63 @@ class Rest:
             # Extract query parameters from the request
             query_params = req.query_params
             log_format = query_params.get("format", "json") 
-            log_page = int(query_params.get("page", 1))
+            log_page = max(1, int(query_params.get("page", 1)))
+            log_limit = query_params.get("limit")
             filter_key = query_params.get("filter_key")
             filter_value = query_params.get("filter_value")
+            # Time range (ISO 8601), archived segments are only read when a range is given
+            start = self.parse_timestamp(query_params.get("from"))
+            end = self.parse_timestamp(query_params.get("to"))
             
-            await self.logs_handler.load_logs_cache_json(get_logs_json_path())
+            store = await self.logs_handler.load_logs_cache_json(get_logs_json_path())
+            if start is not None or end is not None:
+                segments = await self.logs_handler.load_segments(get_logs_manifest_path(), start, end)
+                store = LogView(segments + [store], start, end)
 
-            filtered_logs = [
-                log
-                for log in self.logs_handler.logs_cache
-                if not filter_key or log.get(filter_key) == filter_value
-            ]
-            if filtered_logs == []:
-                filtered_logs = self.logs_handler.logs_cache
+            # All the logs are returned when no log matches the filter
+            if filter_key and store.count(filter_key, filter_value) == 0:
+                filter_key = filter_value = None
 
             if log_format == "json":
-                return filtered_logs
-
-            
+                # Only one page when a limit is given
+                if log_limit:
+                    limit = int(log_limit)
+                    return store.page((log_page - 1) * limit, limit, filter_key, filter_value)
+                return store.page(filter_key=filter_key, filter_value=filter_value)
 
             elif log_format == "html":
                 # Generate an HTML table
-                return await self.logs_handler.render_html_logs(content=filtered_logs, page=log_page, records_per_page=50)
+                records_per_page = 50
+                logs = store.page((log_page - 1) * records_per_page, records_per_page, filter_key, filter_value, ids=True)
+                return await self.logs_handler.render_html_logs(
+                    content=[log for _, log in logs],
+                    page=log_page,
+                    records_per_page=records_per_page,
+                    total=store.count(filter_key, filter_value),
+                    ids=[id for id, _ in logs],
+                    # The pagination links keep the filter and the time range
+                    params={
+                        name: query_params[name]
+                        for name in ("filter_key", "filter_value", "from", "to")
+                        if query_params.get(name)
+                    },
+                )
 
             else:
-                return "\n".join(filtered_logs)
+                return "\n".join(json.dumps(log) for log in store.page(filter_key=filter_key, filter_value=filter_value))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to fetch logs: {str(e)}")
 
+    @staticmethod
+    def parse_timestamp(value: str):
+        if not value:
+            return None
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+
     def _is_valid_json(self, string: str) -> bool:
         try:
             json.loads(string)
@@ -229,8 +287,8 @@ class Rest:
         try:
 
             # Retrieve the `id` from the query string
-            id = int(request.query_params.get("id", -1))
-            return await self.logs_handler.get_log_details(id)
+            id = request.query_params.get("id", "-1")
+            return await self.logs_handler.get_log_details(id, get_logs_manifest_path())
 
         except ValueError:
             # Handle cases where `id` is not a valid integer
@@ -277,19 +335,18 @@ class Rest:
         try:
             openai_url, openai_key = await self.get_ai_module_params()
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    openai_url,
-                    json={
-                        "model": "gpt-4o-mini",
-                        "messages": message,
-                        "max_tokens": 1500,
-                    },
-                    headers={
-                        "Authorization": f"Bearer {openai_key}",
-                        "Content-Type": "application/json",
-                    },
-                )
+            response = await self.http_clients.get(openai_url).post(
+                openai_url,
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": message,
+                    "max_tokens": 1500,
+                },
+                headers={
+                    "Authorization": f"Bearer {openai_key}",
+                    "Content-Type": "application/json",
+                },
+            )
             
             response_data = response.json()
 
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with a time-to-live per entry.
+
+    Entries are evicted in least-recently-used order once `max_size` is reached,
+    and are considered missing once their time-to-live has elapsed.
+    A `ttl` of None (or 0) keeps entries until they are evicted or invalidated.
+
+    The cache can be shared by threads (e.g. sync dependencies run in the threadpool):
+    the entries are changed under a lock.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def configure(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        """
+        Change the default time-to-live and/or the maximum number of entries.
+        """
+        with self.lock:
+            self.ttl = ttl
+            if max_size is not None:
+                self.max_size = max_size
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self.entries.pop(key, None)
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store `value` for `key`. `ttl` overrides the default time-to-live for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove `key` from the cache and return its value.
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove every entry whose key matches `predicate`.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self.lock:
+            keys = [key for key in self.entries if predicate(key)]
+            for key in keys:
+                self.entries.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> int:
+        """
+        Remove all entries from the cache.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self.lock:
+            count = len(self.entries)
+            self.entries.clear()
+        return count
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),                          # Number of cached entries
+            "max_size": self.max_size,                          # Maximum number of entries
+            "ttl": self.ttl,                                    # Default time-to-live (seconds)
+            "hits": self.hits,                                  # Lookups served from the cache
+            "misses": self.misses,                              # Lookups that were missing or expired
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -1,17 +1,54 @@
 import os
 import base64
+from functools import lru_cache
+from typing import Iterable, List
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from liberty.framework.utils.jwt import JWT
 
+# Number of derived keys kept in memory, one per decrypted value (salt)
+KEY_CACHE_SIZE = 1024
+
+def derive_key(masterkey: bytes, salt: bytes) -> bytes:
+    """
+    Derive the AES key of an encrypted value from the master key and its salt.
+    """
+    # derive encryption key: 32 byte key length
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA512(),
+        length=32,
+        salt=salt,
+        iterations=2145,
+        backend=default_backend()
+    )
+    return kdf.derive(masterkey)
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def cached_key(masterkey: bytes, salt: bytes) -> bytes:
+    """
+    Derive the AES key of a value to decrypt, see `derive_key`.
+    The derivation is costly by design, keys are cached by (master key, salt):
+    the same encrypted values (passwords of the pools, the users...) are decrypted again and again.
+    Encryption does not use the cache, each encrypted value has a new salt.
+    """
+    return derive_key(masterkey, salt)
+
 class Encryption:
     def __init__(self, jwt: JWT):
         self.jwt = jwt
 
+    def get_master_key(self) -> bytes:
+        # Secrets are kept in memory by JWT, keys derived from a previous master key are no longer used
+        return self.jwt.get_secret_key("MASTER_KEY").encode("utf-8")
+
+    def clear_cache(self):
+        """Forget the derived keys."""
+        cached_key.cache_clear()
+
     def encrypt_text(self, text):
-        masterkey = self.jwt.get_secret_key("MASTER_KEY").encode("utf-8") 
+        masterkey = self.get_master_key()
         ENCRYPTION_PREFIX = "ENC:"
 
         if text.startswith(ENCRYPTION_PREFIX):
@@ -25,14 +62,7 @@ class Encryption:
         salt = os.urandom(64)
         
         # derive encryption key: 32 byte key length
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA512(),
-            length=32,
-            salt=salt,
-            iterations=2145,
-            backend=default_backend()
-        )
-        key = kdf.derive(masterkey)
+        key = derive_key(masterkey, salt)
         
         # AES 256 GCM Mode
         encryptor = Cipher(
@@ -52,7 +82,7 @@ class Encryption:
         return ENCRYPTION_PREFIX + encryptedData
 
     def decrypt_text(self, encdata):
-        masterkey = self.jwt.get_secret_key("MASTER_KEY").encode("utf-8") 
+        masterkey = self.get_master_key()
         ENCRYPTION_PREFIX = "ENC:"
 
         if encdata.startswith(ENCRYPTION_PREFIX):
@@ -70,14 +100,7 @@ class Encryption:
         text = b_data[96:]
         
         # derive key using; 32 byte key length
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA512(),
-            length=32,
-            salt=salt,
-            iterations=2145,
-            backend=default_backend()
-        )
-        key = kdf.derive(masterkey)
+        key = cached_key(masterkey, salt)
         
         # AES 256 GCM Mode
         decryptor = Cipher(
@@ -89,4 +112,8 @@ class Encryption:
         # decrypt the given text
         decrypted = decryptor.update(text) + decryptor.finalize()
         
-        return decrypted.decode('utf-8')
\ No newline at end of file
+        return decrypted.decode('utf-8')
+
+    def decrypt_many(self, values: Iterable[str]) -> List[str]:
+        """Decrypt several values, e.g. a stored password and the password to compare."""
+        return [self.decrypt_text(value) for value in values]
@@ -0,0 +1,101 @@
+import logging
+logger = logging.getLogger(__name__)
+
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # h2 is optional, clients use HTTP/1.1
+    h2 = None
+
+
+class NoCookiesPolicy(DefaultCookiePolicy):
+    """
+    Cookie policy rejecting all cookies: the clients are shared by the APIs and the users
+    calling a host, a session cookie set for one call must not be sent with the next ones.
+    """
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+
+class HttpClients:
+    """
+    Outbound HTTP clients shared by the requests, one per host.
+
+    Each client keeps its connections alive between calls (TLS handshakes are not repeated),
+    within `max_connections` connections to the host. HTTP/2 is negotiated when the h2 package
+    is installed. Cookies are never stored. The clients are created on first use and closed by
+    `close`, on shutdown.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, keepalive_expiry: float = 30.0,
+                 connect_timeout: float = 10.0, timeout: float = 60.0, http2: bool = True):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.http2 = http2
+        # Clients by (scheme, host and port, verify)
+        self.clients: Dict[Tuple[str, str, bool], httpx.AsyncClient] = {}
+
+    def configure(self, max_connections: int = None, max_keepalive: int = None, keepalive_expiry: float = None,
+                  connect_timeout: float = None, timeout: float = None, http2: bool = None):
+        """
+        Change the settings of the clients, applied to the clients created afterwards.
+        """
+        if max_connections:
+            self.max_connections = max_connections
+        if max_keepalive is not None:
+            self.max_keepalive = max_keepalive
+        if keepalive_expiry is not None:
+            self.keepalive_expiry = keepalive_expiry
+        if connect_timeout:
+            self.connect_timeout = connect_timeout
+        if timeout:
+            self.timeout = timeout
+        if http2 is not None:
+            self.http2 = http2
+
+    def get(self, url: str, verify: bool = True) -> httpx.AsyncClient:
+        """
+        Get the client of the host of a URL.
+
+        Args:
+            url (str): The URL called.
+            verify (bool): Verify the TLS certificate of the host.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc.lower(), verify)
+        client = self.clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                verify=verify,
+                cookies=CookieJar(policy=NoCookiesPolicy()),
+                http2=self.http2 and h2 is not None,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self.clients[key] = client
+        return client
+
+    async def close(self):
+        """
+        Close all clients and their connections.
+        """
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client: {str(e)}")
@@ -10,19 +10,37 @@ from pathlib import Path
 from cryptography.fernet import Fernet
 import os
 import json
+import time
+from liberty.framework.utils.cache import TTLCache
+from typing import Callable, Dict, List
 
 SECRETS_FILE = get_secrets_path()
 ENCRYPTED_SECRETS_FILE = get_encrypted_path()
 KEY_FILE = get_key_path()
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 240
+# Seconds between two checks of the secrets files for changes
+SECRETS_CHECK_INTERVAL = 5
+# Seconds a verified token is kept in memory, bounded by its expiration
+TOKEN_CACHE_TTL = 300
+TOKEN_CACHE_SIZE = 10000
 oauth2_scheme = HTTPBearer()
 
 class JWT:
 
     def __init__(self):
+        # Decrypted secrets, loaded once and reloaded when the files change
+        self.secrets: Dict[str, str] = None
+        self.secrets_version = None
+        self.secrets_checked = 0
+        # Functions called after the secrets have been reloaded
+        self.reload_listeners: List[Callable[[], None]] = []
         # OAuth2 schema
         self.init_encryption_files()
+        self.load_secrets()
+        # Verified tokens and their subject, tokens signed with a previous key are verified again
+        self.token_cache = TTLCache(ttl=TOKEN_CACHE_TTL, max_size=TOKEN_CACHE_SIZE)
+        self.on_reload(self.token_cache.clear)
 
     def init_encryption_files(self):
         if not Path(ENCRYPTED_SECRETS_FILE).exists():
@@ -89,10 +107,55 @@ class JWT:
         return json.loads(decrypted_secrets)
 
 
-    # Decrypt and load the secrets
+    def get_secrets_version(self):
+        # Modification time and size of the key and secrets files
+        version = []
+        for file in (KEY_FILE, ENCRYPTED_SECRETS_FILE):
+            try:
+                stat = os.stat(file)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    # Decrypt and load the secrets in memory
+    def load_secrets(self):
+        version = self.get_secrets_version()
+        self.secrets = self.decrypt_secrets(ENCRYPTED_SECRETS_FILE, KEY_FILE)
+        self.secrets_version = version
+        self.secrets_checked = time.monotonic()
+
+    def on_reload(self, listener: Callable[[], None]):
+        """Register a function called after the secrets have been reloaded."""
+        self.reload_listeners.append(listener)
+
+    def reload_secrets(self):
+        """Reload the secrets from the files, e.g. after the keys have been rotated."""
+        self.load_secrets()
+        logging.warning("Secrets reloaded")
+        for listener in self.reload_listeners:
+            listener()
+
+    def check_secrets(self):
+        # The files are checked at most every SECRETS_CHECK_INTERVAL seconds
+        now = time.monotonic()
+        if now - self.secrets_checked < SECRETS_CHECK_INTERVAL:
+            return
+        self.secrets_checked = now
+        if self.get_secrets_version() != self.secrets_version:
+            try:
+                self.reload_secrets()
+            except Exception as e:
+                # Files being rewritten, keep the current secrets and retry on the next check
+                logging.error(f"Secrets could not be reloaded: {str(e)}")
+
+    # Get a secret from memory
     def get_secret_key(self, key):
-        secrets = self.decrypt_secrets(ENCRYPTED_SECRETS_FILE, KEY_FILE)
-        return secrets.get(key)
+        if self.secrets is None:
+            self.load_secrets()
+        else:
+            self.check_secrets()
+        return self.secrets.get(key)
 
     # Generate a token
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None):
@@ -107,10 +170,22 @@ class JWT:
     def is_valid_jwt(self, token: HTTPAuthorizationCredentials = Depends(oauth2_scheme)):
         try:
             token_str = token.credentials
-            payload = jwt.decode(token_str, self.get_secret_key("SECRET_KEY"), algorithms=[ALGORITHM])
+            secret_key = self.get_secret_key("SECRET_KEY")
+            user = self.token_cache.get(token_str)
+            if user is not None:
+                return user
+
+            payload = jwt.decode(token_str, secret_key, algorithms=[ALGORITHM])
             user: str = payload.get("sub")
             if user is None:
                 raise HTTPException(status_code=401, detail="Invalid token")
+
+            # Cached until the token expires
+            ttl = TOKEN_CACHE_TTL
+            if payload.get("exp") is not None:
+                ttl = min(ttl, payload["exp"] - time.time())
+            if ttl > 0:
+                self.token_cache.set(token_str, user, ttl=ttl)
             return user
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
@@ -1,17 +1,456 @@
 import logging
 logger = logging.getLogger(__name__)
 
+import gzip
+import hashlib
+import heapq
+import html
 import json
+import os
 import re
+import shutil
+import time
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from urllib.parse import urlencode
 from fastapi import HTTPException, Query
 from fastapi.responses import HTMLResponse
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
 import asyncio
+from liberty.framework.utils.cache import TTLCache
+
+
+def read_manifest(manifest_path: str) -> Dict[str, Any]:
+    """
+    Read the manifest of the archived log segments.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"segments": []}
+
+
+def segment_id(first_line: bytes) -> str:
+    """
+    Identify a JSON log file by its first line: the file keeps its identifier when it is rotated
+    into a segment, unlike its name or inode.
+    """
+    return hashlib.sha1(first_line.rstrip(b"\n")).hexdigest()[:16]
+
+
+def write_manifest(manifest_path: str, manifest: Dict[str, Any]):
+    # Replaced atomically, readers never see a partial manifest
+    temporary_path = f"{manifest_path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temporary_path, manifest_path)
+
+
+class LogStore:
+    """
+    Append-only store of the logs of a JSON log file (one JSON object per line).
+
+    The file is read incrementally from the offset of the last complete line, the entries are
+    kept in memory with a timeline ordered by timestamp. Indexes by field value are built
+    on the first filter on a field and then maintained as new entries are read.
+
+    Entries are identified by the file (see `segment_id`) and the byte offset of their line,
+    the identifier stays valid when the file is rotated into a segment.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.file_id = None
+        self.segment_id: Optional[str] = None
+        self.entries: List[Dict[str, Any]] = []
+        # Byte offset of the line of each entry, in ascending order
+        self.offsets: List[int] = []
+        # (timestamp, entry id) in ascending order, the most recent entries are at the end
+        self.timeline: List[Tuple[float, int]] = []
+        # field -> value -> (timestamp, entry id) in ascending order
+        self.indexes: Dict[str, Dict[Any, List[Tuple[float, int]]]] = {}
+        self.lock = asyncio.Lock()
+
+    def reset(self):
+        self.offset = 0
+        self.segment_id = None
+        self.entries = []
+        self.offsets = []
+        self.timeline = []
+        self.indexes = {}
+
+    @staticmethod
+    def sort_key(log: Dict[str, Any]) -> float:
+        try:
+            return datetime.fromisoformat(log["timestamp"]).timestamp()
+        except Exception:
+            # Entries without a valid timestamp are the oldest
+            return 0.0
+
+    def read_lines(self) -> Tuple[int, bytes]:
+        """
+        Read the complete lines added to the file since the last call, and their offset.
+        The store is reset if the file has been replaced or truncated.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated, the file is created again by the next write
+            self.reset()
+            self.file_id = None
+            return 0, b""
+
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.offset:
+            self.reset()
+            self.file_id = file_id
+        if stat.st_size == self.offset:
+            return self.offset, b""
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+
+        # A line being written is read on the next call
+        offset = self.offset
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return offset, data[:end]
+
+    def append(self, log: Dict[str, Any], offset: int):
+        entry_id = len(self.entries)
+        self.entries.append(log)
+        self.offsets.append(offset)
+        position = (self.sort_key(log), entry_id)
+        insort(self.timeline, position)
+        for field, index in self.indexes.items():
+            # Filter values are strings, other values never match
+            if isinstance(log.get(field), str):
+                insort(index.setdefault(log[field], []), position)
+
+    def load(self, data: bytes, offset: int = 0):
+        """
+        Parse and index the complete lines of the file read from `offset`.
+        """
+        for line in data.split(b"\n")[:-1]:
+            if offset == 0:
+                self.segment_id = segment_id(line)
+            log = LogHandler.parse_log(line.decode("utf-8", errors="replace"))
+            if isinstance(log, dict):
+                self.append(log, offset)
+            offset += len(line) + 1
+
+    async def refresh(self):
+        """
+        Read and index the entries added to the file.
+        """
+        async with self.lock:
+            offset, data = await asyncio.to_thread(self.read_lines)
+            self.load(data, offset)
+
+    def log_id(self, entry_id: int) -> str:
+        """Get the identifier of an entry, see `find`."""
+        return f"{self.segment_id}:{self.offsets[entry_id]}"
+
+    def find(self, offset: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry of the line at a byte offset.
+        """
+        index = bisect_left(self.offsets, offset)
+        if index < len(self.offsets) and self.offsets[index] == offset:
+            return self.entries[index]
+        return None
+
+    def positions(self, filter_key: Optional[str] = None, filter_value: Optional[str] = None) -> List[Tuple[float, int]]:
+        """
+        Get the positions of the entries matching a filter, in ascending order of timestamp.
+        """
+        if not filter_key:
+            return self.timeline
+        if filter_key not in self.indexes:
+            index = {}
+            for position in self.timeline:
+                log = self.entries[position[1]]
+                if isinstance(log.get(filter_key), str):
+                    index.setdefault(log[filter_key], []).append(position)
+            self.indexes[filter_key] = index
+        return self.indexes[filter_key].get(filter_value, [])
+
+    def count(self, filter_key: Optional[str] = None, filter_value: Optional[str] = None) -> int:
+        return len(self.positions(filter_key, filter_value))
+
+    def page(self, start: int = 0, limit: Optional[int] = None, filter_key: Optional[str] = None, filter_value: Optional[str] = None,
+             ids: bool = False) -> List[Any]:
+        """
+        Get the entries matching a filter, the most recent first.
+
+        Args:
+            start (int): Number of entries to skip.
+            limit (int): Maximum number of entries, all the entries if None.
+            ids (bool): Return (identifier, entry) tuples, see `log_id`.
+        """
+        positions = self.positions(filter_key, filter_value)
+        end = len(positions) - start
+        begin = 0 if limit is None else max(0, end - limit)
+        if end <= 0:
+            return []
+        return [
+            (self.log_id(entry_id), self.entries[entry_id]) if ids else self.entries[entry_id]
+            for _, entry_id in reversed(positions[begin:end])
+        ]
+
+
+class LogView:
+    """
+    Logs of several stores, e.g. the current log file and archived segments, in a time range.
+    Provides the `count` and `page` methods of LogStore, the entries of the stores are merged by timestamp.
+    """
+
+    def __init__(self, stores: List[LogStore], start: Optional[float] = None, end: Optional[float] = None):
+        self.stores = stores
+        self.start = start
+        self.end = end
+
+    def positions(self, store: LogStore, filter_key: Optional[str] = None, filter_value: Optional[str] = None) -> List[Tuple[float, int]]:
+        positions = store.positions(filter_key, filter_value)
+        low = 0 if self.start is None else bisect_left(positions, (self.start, -1))
+        high = len(positions) if self.end is None else bisect_right(positions, (self.end, float("inf")))
+        return positions[low:high]
+
+    def count(self, filter_key: Optional[str] = None, filter_value: Optional[str] = None) -> int:
+        return sum(len(self.positions(store, filter_key, filter_value)) for store in self.stores)
+
+    def latest(self, store: LogStore, filter_key: Optional[str], filter_value: Optional[str]):
+        # Entries of a store, the most recent first
+        for timestamp, entry_id in reversed(self.positions(store, filter_key, filter_value)):
+            yield timestamp, store, entry_id
+
+    def page(self, start: int = 0, limit: Optional[int] = None, filter_key: Optional[str] = None, filter_value: Optional[str] = None,
+             ids: bool = False) -> List[Any]:
+        merged = heapq.merge(
+            *(self.latest(store, filter_key, filter_value) for store in self.stores),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        return [
+            (store.log_id(entry_id), store.entries[entry_id]) if ids else store.entries[entry_id]
+            for _, store, entry_id in islice(merged, start, None if limit is None else start + limit)
+        ]
+
+
+class LogWriter:
+    """
+    Background writer of the frontend logs.
+
+    Log entries are queued by the requests and appended to the text and JSON log files
+    in batches, by a task running until `stop`: a batch is written when `batch_size` entries
+    are queued or every `flush_interval` seconds. When the queue is full, requests wait up to
+    `put_timeout` seconds for room before failing.
+
+    The files are rotated when the JSON file reaches `max_bytes` or its first entry is older than
+    `max_age` seconds: they are compressed into gzip segments listed in the manifest, the oldest
+    segments are removed beyond `max_segments`.
+    """
+
+    def __init__(self, text_path: str, json_path: str, manifest_path: str = None, batch_size: int = 100,
+                 flush_interval: float = 1.0, queue_size: int = 10000, put_timeout: float = 5.0,
+                 max_bytes: int = 10 * 1024 * 1024, max_age: int = 86400, max_segments: int = 30):
+        self.text_path = text_path
+        self.json_path = json_path
+        self.manifest_path = manifest_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_segments = max_segments
+        # Timestamp of the first entry of the current JSON file, see should_rotate
+        self.segment_start: Optional[float] = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.put_timeout = put_timeout
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def configure(self, batch_size: int = None, flush_interval: float = None, queue_size: int = None,
+                  max_bytes: int = None, max_age: int = None, max_segments: int = None):
+        """
+        Change the settings of the writer, before it is started. 0 disables a rotation limit.
+        """
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if max_age is not None:
+            self.max_age = max_age
+        if max_segments is not None:
+            self.max_segments = max_segments
+        if batch_size:
+            self.batch_size = batch_size
+        if flush_interval:
+            self.flush_interval = flush_interval
+        if queue_size:
+            self.queue_size = queue_size
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self):
+        if not self.running:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Stop the writer once the queued entries have been written.
+        """
+        if not self.running:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    async def put(self, entries: List[Tuple[str, str]]):
+        """
+        Queue log entries, as (text, json) lines. Entries are written directly if the writer is not running,
+        or if they cannot fit in the queue.
+
+        The entries are queued all at once, or not at all: a request failing on a full queue can be
+        retried without duplicating entries.
+
+        Raises:
+            TimeoutError: If the queue has no room for the entries for put_timeout seconds.
+        """
+        if not self.running or len(entries) > self.queue.maxsize:
+            await asyncio.to_thread(self.write, entries)
+            return
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.put_timeout
+        while self.queue.maxsize - self.queue.qsize() < len(entries):
+            if loop.time() >= deadline:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(min(0.05, self.flush_interval))
+        # No await between the check and the puts, the room cannot be taken in between
+        for entry in entries:
+            self.queue.put_nowait(entry)
+
+    def first_timestamp(self) -> Optional[float]:
+        try:
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                log = LogHandler.parse_log(f.readline())
+            return LogStore.sort_key(log) if isinstance(log, dict) else None
+        except FileNotFoundError:
+            return None
+
+    def should_rotate(self) -> bool:
+        if not self.manifest_path:
+            return False
+        try:
+            size = os.path.getsize(self.json_path)
+        except FileNotFoundError:
+            return False
+        if size == 0:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        if self.max_age:
+            if self.segment_start is None:
+                self.segment_start = self.first_timestamp()
+            return self.segment_start is not None and time.time() - self.segment_start >= self.max_age
+        return False
+
+    def rotate(self):
+        """
+        Compress the current log files into a new segment and add it to the manifest.
+        """
+        suffix = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        segment = {"start": None, "end": None, "count": 0}
+        for kind, path in (("json", self.json_path), ("text", self.text_path)):
+            if not os.path.exists(path):
+                continue
+            archive = f"{path}.{suffix}.gz"
+            with open(path, "rb") as source, gzip.open(archive, "wb") as target:
+                if kind == "json":
+                    # Time range of the segment, used to select the segments to read
+                    for line in source:
+                        if "id" not in segment:
+                            # Identifier of the entries of the file, see LogStore
+                            segment["id"] = segment_id(line)
+                        target.write(line)
+                        log = LogHandler.parse_log(line)
+                        if isinstance(log, dict):
+                            timestamp = LogStore.sort_key(log)
+                            segment["start"] = timestamp if segment["start"] is None else min(segment["start"], timestamp)
+                            segment["end"] = timestamp if segment["end"] is None else max(segment["end"], timestamp)
+                            segment["count"] += 1
+                else:
+                    shutil.copyfileobj(source, target)
+            os.remove(path)
+            segment[kind] = os.path.basename(archive)
+        self.segment_start = None
+
+        manifest = read_manifest(self.manifest_path)
+        manifest["segments"].append(segment)
+        # Remove the oldest segments
+        while self.max_segments and len(manifest["segments"]) > self.max_segments:
+            removed = manifest["segments"].pop(0)
+            for kind in ("json", "text"):
+                if removed.get(kind):
+                    try:
+                        os.remove(os.path.join(os.path.dirname(self.manifest_path), removed[kind]))
+                    except FileNotFoundError:
+                        pass
+        write_manifest(self.manifest_path, manifest)
+        logger.info(f"Log files rotated: {segment.get('json')}")
+
+    def write(self, entries: List[Tuple[str, str]]):
+        if self.should_rotate():
+            try:
+                self.rotate()
+            except Exception as e:
+                # Entries are still written to the current files, rotation is retried on the next batch
+                logger.error(f"Failed to rotate log files: {str(e)}")
+        with open(self.text_path, "a") as text_file:
+            text_file.write("".join(text for text, _ in entries))
+        with open(self.json_path, "a") as json_file:
+            json_file.write("".join(json_line for _, json_line in entries))
+
+    async def run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            entry = await self.queue.get()
+            if entry is None:
+                break
+            batch.append(entry)
+
+            # Collect the batch until it is full or the flush interval has elapsed
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    entry = self.queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self.queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            try:
+                await asyncio.to_thread(self.write, batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} log entries: {str(e)}")
+
 
 class LogHandler:
     def __init__(self):
         self.logs_cache = []
+        # Stores of the JSON log files by path, see load_logs_cache_json
+        self.stores: Dict[str, LogStore] = {}
+        self.store: Optional[LogStore] = None
+        # Stores of the archived segments, by path (segments never change)
+        self.segments = TTLCache(max_size=8)
 
     def parse_log_entry(self, log_entry_lines: List[str]) -> Optional[Dict[str, any]]:
         """
@@ -92,24 +531,16 @@ class LogHandler:
         except json.JSONDecodeError:
             return None
         
-    async def load_logs_cache_json(self, log_file_path: str) -> None:
+    async def load_logs_cache_json(self, log_file_path: str) -> LogStore:
         """
-        Asynchronously reads a log file, parses the logs, and sorts them by timestamp in descending order.
+        Read the logs added to a JSON log file since the last call, and return the store of the file.
         """
         try:
-            # Read the log file asynchronously
-            data = await asyncio.to_thread(self.read_file, log_file_path)
-
-            # Parse and process the logs
-            self.logs_cache = [
-                self.parse_log(line) for line in data.strip().split("\n")
-            ]
-
-            # Filter out invalid logs and sort by timestamp
-            self.logs_cache = [log for log in self.logs_cache if log is not None]
-            self.logs_cache.sort(
-                key=lambda log: datetime.fromisoformat(log["timestamp"]), reverse=True
-            )
+            if log_file_path not in self.stores:
+                self.stores[log_file_path] = LogStore(log_file_path)
+            self.store = self.stores[log_file_path]
+            await self.store.refresh()
+            return self.store
 
         except FileNotFoundError:
             logging.error(f"Error: File not found - {log_file_path}")
@@ -118,6 +549,44 @@ class LogHandler:
             logging.error(f"Error reading log file: {e}")
             raise
         
+    @staticmethod
+    def read_segment(segment_path: str) -> LogStore:
+        store = LogStore(segment_path)
+        with gzip.open(segment_path, "rb") as f:
+            data = f.read()
+        # The last line is complete in a segment
+        store.load(data if not data or data.endswith(b"\n") else data + b"\n")
+        return store
+
+    async def load_segment(self, segment_path: str) -> Optional[LogStore]:
+        """
+        Load an archived segment, None if it has been removed.
+        """
+        store = self.segments.get(segment_path)
+        if store is None:
+            try:
+                store = await asyncio.to_thread(self.read_segment, segment_path)
+            except FileNotFoundError:
+                return None
+            self.segments.set(segment_path, store)
+        return store
+
+    async def load_segments(self, manifest_path: str, start: Optional[float] = None, end: Optional[float] = None) -> List[LogStore]:
+        """
+        Load the archived segments whose time range overlaps [start, end].
+        """
+        manifest = await asyncio.to_thread(read_manifest, manifest_path)
+        stores = []
+        for segment in manifest.get("segments", []):
+            if not segment.get("json") or segment.get("start") is None:
+                continue
+            if (end is not None and segment["start"] > end) or (start is not None and segment["end"] < start):
+                continue
+            store = await self.load_segment(os.path.join(os.path.dirname(manifest_path), segment["json"]))
+            if store is not None:
+                stores.append(store)
+        return stores
+
     async def load_logs_cache_text(self, log_file_path: str):
         """
         Load logs from a file into the logs cache, sorted by timestamp in descending order.
@@ -154,24 +623,36 @@ class LogHandler:
             )
 
     async def render_html_logs(self,
-        content: List[Dict[str, Any]], page: int = 1, records_per_page: int = 50
+        content: List[Dict[str, Any]], page: int = 1, records_per_page: int = 50, total: Optional[int] = None,
+        ids: Optional[List[str]] = None, params: Optional[Dict[str, str]] = None
     ) -> HTMLResponse:
         """
         Generate an HTML table with the given logs and pagination.
 
         Args:
-            logs (List[Dict[str, Any]]): The list of logs to display.
+            logs (List[Dict[str, Any]]): The list of logs to display, or only the logs of the page if total is given.
             page (int): Current page number for pagination.
             records_per_page (int): Number of records per page.
+            total (int): Total number of logs, when content only contains the logs of the page.
+            ids (List[str]): Identifiers of the logs of the page (see LogStore), positions in content if None.
+            params (Dict[str, str]): Query parameters kept by the pagination links (filter, time range).
 
         Returns:
             HTMLResponse: A styled HTML table response with logs.
         """
         # Pagination logic
-        total_pages = max(1, (len(content) + records_per_page - 1) // records_per_page)
         start_idx = (page - 1) * records_per_page
-        end_idx = start_idx + records_per_page
-        paginated_logs = content[start_idx:end_idx]
+        if total is None:
+            total = len(content)
+            paginated_logs = content[start_idx:start_idx + records_per_page]
+        else:
+            paginated_logs = content
+        total_pages = max(1, (total + records_per_page - 1) // records_per_page)
+        if ids is None:
+            ids = [str(start_idx + index) for index in range(len(paginated_logs))]
+
+        def page_url(number: int) -> str:
+            return html.escape("?" + urlencode({**(params or {}), "format": "html", "page": number}))
 
         # HTML Table structure
         html_table = f"""
@@ -258,10 +739,10 @@ class LogHandler:
         <body>
             <h1>Log Entries</h1>
             <div class="pagination">
-                {f'<a href="?format=html&page=1">First</a>' if page > 1 else ''}
-                {f'<a href="?format=html&page={page - 1}">Previous</a>' if page > 1 else ''}
-                {f'<a href="?format=html&page={page + 1}">Next</a>' if page < total_pages else ''}
-                {f'<a href="?format=html&page={total_pages}">Last</a>' if page < total_pages else ''}
+                {f'<a href="{page_url(1)}">First</a>' if page > 1 else ''}
+                {f'<a href="{page_url(page - 1)}">Previous</a>' if page > 1 else ''}
+                {f'<a href="{page_url(page + 1)}">Next</a>' if page < total_pages else ''}
+                {f'<a href="{page_url(total_pages)}">Last</a>' if page < total_pages else ''}
             </div>         
             <div class="pagination">
                 <button class="download-btn" onclick="downloadLogs('csv')">Download CSV</button>
@@ -290,7 +771,7 @@ class LogHandler:
                             <td>{log.get("category", "")}</td>
                             <td>{log.get("feature", "")}</td>
                             <td>{log.get("isException", "")}</td>
-                            <td><a href="/api/logs/details?id={start_idx + index}" target="_blank">View Details</a></td>
+                            <td><a href="/api/logs/details?{html.escape(urlencode({"id": ids[index]}))}" target="_blank">View Details</a></td>
                         </tr>
                         '''
                         for index, log in enumerate(paginated_logs)
@@ -298,9 +779,14 @@ class LogHandler:
                 </tbody>
             </table>
             <script>
-                const logs = {json.dumps(content)};
-
-                function downloadLogs(format) {{
+                async function downloadLogs(format) {{
+                    // Logs are fetched on demand, the page only contains the current records.
+                    // All the logs matching the filter and the time range of the page are exported
+                    const params = new URLSearchParams(window.location.search);
+                    params.set('format', 'json');
+                    params.delete('page');
+                    params.delete('limit');
+                    const logs = await (await fetch('/api/logs?' + params.toString())).json();
                     if (format === 'json') {{
                         const blob = new Blob([JSON.stringify(logs, null, 2)], {{ type: 'application/json' }});
                         const url = URL.createObjectURL(blob);
@@ -332,17 +818,34 @@ class LogHandler:
         return HTMLResponse(content=html_table)
     
 
-    async def get_log_details(self, id: int = Query(..., description="The ID of the log entry to fetch")):
+    async def get_log_details(self, id: str = Query(..., description="The ID of the log entry to fetch"), manifest_path: Optional[str] = None):
         """
         Get log details by ID.
         Args:
-            id (int): The log ID to fetch.
+            id (str): The log ID to fetch, file and byte offset (see LogStore) or position in the text logs.
+            manifest_path (str): The manifest of the archived segments, searched when the file has been rotated.
         Returns:
             dict: The log entry if found.
         Raises:
             HTTPException: If the log ID is invalid or not found.
         """
+        if ":" in id:
+            segment, offset = id.rsplit(":", 1)
+            offset = int(offset)
+            store = self.store if self.store is not None and self.store.segment_id == segment else None
+            if store is None and manifest_path:
+                manifest = await asyncio.to_thread(read_manifest, manifest_path)
+                for archived in manifest.get("segments", []):
+                    if archived.get("id") == segment and archived.get("json"):
+                        store = await self.load_segment(os.path.join(os.path.dirname(manifest_path), archived["json"]))
+                        break
+            log = store.find(offset) if store is not None else None
+            if log is None:
+                raise HTTPException(status_code=404, detail="Log entry not found")
+            return log
+
         # Check if the log ID is valid and within bounds
+        id = int(id)
         if id >= 0 and id < len(self.logs_cache):
             return self.logs_cache[id]
         else:
@@ -0,0 +1,81 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+from fastapi.responses import JSONResponse as BaseJSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+
+def default(value: Any) -> Any:
+    """
+    Convert the values returned by the database drivers that are not JSON types.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    # Dates and datetimes are serialized natively, as ISO 8601 strings
+    return orjson.dumps(content, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+serializers: Dict[str, Callable[[Any], bytes]] = {"json": json_dumps}
+if orjson is not None:
+    serializers["orjson"] = orjson_dumps
+
+serializer = "orjson" if orjson is not None else "json"
+
+
+def register_serializer(name: str, dumps: Callable[[Any], bytes]):
+    """
+    Register a serializer, a function converting a response content to JSON bytes.
+    """
+    serializers[name] = dumps
+
+
+def set_serializer(name: str):
+    """
+    Select the serializer used for all responses.
+    """
+    global serializer
+    if name not in serializers:
+        logger.warning(f"JSON serializer {name} is not available, using {serializer}")
+        return
+    serializer = name
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a response content to JSON with the selected serializer.
+    """
+    return serializers[serializer](content)
+
+
+class JSONResponse(BaseJSONResponse):
+    """
+    JSON response rendered with the selected serializer.
+    Dates, datetimes and decimals returned by the database are serialized natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)